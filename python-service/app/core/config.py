@@ -10,6 +10,12 @@ env_path = BASE_DIR.parent / ".env"
 print(f"Loading .env from: {env_path}")  # Optional for debugging
 load_dotenv(env_path)
 
+def _java_api_base_url(url: str) -> str:
+    """Reduce a Java endpoint URL to its /api/v1 base"""
+    if "/api/v1" in url:
+        return url.split("/api/v1")[0] + "/api/v1"
+    return "http://java-service:8080/api/v1"
+
 class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
@@ -18,6 +24,9 @@ class Settings:
     # Java callback service
     JAVA_SERVICE_URL: str = os.getenv("JAVA_SERVICE_URL", "")
     SERVICE_API_KEY: str = os.getenv("SERVICE_API_KEY", "")
+    JAVA_API_URL: str = _java_api_base_url(
+        os.getenv("JAVA_API_URL", "http://java-service:8080/api/v1/lesson-topics")
+    )
 
     # Flags
     USE_OPENAI_IF_OLLAMA_FAILS: bool = os.getenv("USE_OPENAI_IF_OLLAMA_FAILS", "false").lower() == "true"
@@ -39,4 +48,7 @@ class Settings:
 
     SERVER_URL: str = os.getenv("SERVER_URL", "http://localhost:8000")
 
+    # PDF page-range pool size per process (0 = auto from CPU count and worker concurrency)
+    PDF_POOL_WORKERS: int = int(os.getenv("PDF_POOL_WORKERS", "0"))
+
 settings = Settings()
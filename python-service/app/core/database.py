@@ -1,5 +1,5 @@
 from sqlalchemy import create_engine, event, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.pool import QueuePool
 from app.core.config import settings
@@ -57,6 +57,9 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Thread-local session registry for Celery tasks (released via ScopedSession.remove())
+ScopedSession = scoped_session(SessionLocal)
+
 # Base class for all models
 Base = declarative_base()
 
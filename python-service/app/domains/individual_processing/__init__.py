@@ -15,6 +15,8 @@ Modules:
 - timetable_extractor.py
 - scheme_extractor.py
 - subject_mapper.py
+- extraction_cache.py
+- subject_catalog.py
 """
 
 __version__ = "0.1.0"
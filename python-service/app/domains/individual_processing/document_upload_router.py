@@ -143,7 +143,7 @@ async def _process_timetable_upload(
     
     try:
         # Extract timetable entries
-        entries = timetable_extractor.extract_timetable(file_path)
+        entries, subjects = timetable_extractor.extract_timetable(file_path)
         
         if not entries:
             logger.warning("⚠️ No timetable entries extracted")
@@ -161,8 +161,8 @@ async def _process_timetable_upload(
         
         logger.info(f"✅ Extracted {len(entries)} timetable entries")
         
-        # Extract unique subjects
-        unique_subjects = list(set(entry.subject for entry in entries))
+        # Unique subjects are collected by the extractor
+        unique_subjects = list(subjects)
         logger.info(f"📚 Found {len(unique_subjects)} unique subjects")
         
         # Map subjects to platform
@@ -257,7 +257,7 @@ async def _process_scheme_upload(
     
     try:
         # Extract scheme topics
-        topics = scheme_extractor.extract_scheme(file_path)
+        topics, subjects, _ = scheme_extractor.extract_scheme(file_path)
         
         if not topics:
             logger.warning("⚠️ No scheme topics extracted")
@@ -275,8 +275,8 @@ async def _process_scheme_upload(
         
         logger.info(f"✅ Extracted {len(topics)} scheme topics")
         
-        # Extract unique subjects
-        unique_subjects = list(set(topic.subject for topic in topics))
+        # Unique subjects are collected by the extractor
+        unique_subjects = list(subjects)
         logger.info(f"📚 Found {len(unique_subjects)} unique subjects")
         
         # Map subjects to platform
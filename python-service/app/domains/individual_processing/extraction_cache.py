@@ -0,0 +1,58 @@
+"""
+app/domains/individual_processing/extraction_cache.py
+Content-addressable cache for timetable/scheme extraction results.
+Re-uploads of the same document skip parsing/OCR and only cost one file hash.
+"""
+import hashlib
+import mmap
+import os
+from typing import Any, Optional
+
+from app.core.logger import get_logger
+from app.core.redis_client import redis_client
+
+logger = get_logger(__name__)
+
+# Bump when extractor output changes so stale results are ignored
+EXTRACTION_CACHE_VERSION = 1
+EXTRACTION_CACHE_TTL = 7 * 24 * 3600  # 7 days
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 hex digest of a file's contents, hashed without loading the whole file"""
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        
+        digest = hashlib.sha256()
+        if os.fstat(f.fileno()).st_size:  # mmap can't map empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Redis-backed extraction cache keyed by (stage, version, file hash)"""
+
+    def __init__(self, stage: str, version: int = EXTRACTION_CACHE_VERSION, ttl_seconds: int = EXTRACTION_CACHE_TTL):
+        self.stage = stage
+        self.version = version
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, file_hash: str) -> str:
+        return f"individual:extraction:{self.stage}:v{self.version}:{file_hash}"
+
+    def get(self, file_hash: str) -> Optional[Any]:
+        """Return the cached JSON value, or None on a miss"""
+        value = redis_client.get(self._key(file_hash))
+        if value is not None:
+            logger.info(f"♻️ Extraction cache hit ({self.stage}): {file_hash[:12]}")
+        return value
+
+    def set(self, file_hash: str, value: Any) -> bool:
+        """Store a JSON-serializable extraction result"""
+        return redis_client.set_with_ttl(self._key(file_hash), value, self.ttl_seconds)
+
+
+timetable_cache = ExtractionCache("timetable")
+scheme_cache = ExtractionCache("scheme")
@@ -0,0 +1,116 @@
+"""
+app/domains/individual_processing/pdf_pool.py
+Process pool shared by the PDF extractors for page-range parallelism.
+One pool per process, created on first use and sized so the processes of a
+Celery worker together don't oversubscribe the CPUs. Daemonic processes (Celery
+prefork children) may not start child processes, so they always extract serially,
+and any pool failure falls back to serial extraction.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Concurrency of the Celery worker running in this process (1 outside Celery).
+# Recorded from the worker itself (tasks.py), so it can't drift from --concurrency.
+_worker_concurrency = 1
+
+# Documents are only split when every worker gets at least this many pages,
+# so each range's round trip to the pool carries some real extraction work
+MIN_PAGES_PER_WORKER = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def set_worker_concurrency(concurrency: int) -> None:
+    """Record the running Celery worker's concurrency (its processes share the CPUs)"""
+    global _worker_concurrency
+    _worker_concurrency = max(1, concurrency or 1)
+
+
+def pdf_pool_workers() -> int:
+    """Pool size for this process; the PDF_POOL_WORKERS setting overrides it (1 = serial)"""
+    return settings.PDF_POOL_WORKERS or min(8, max(1, (os.cpu_count() or 1) // _worker_concurrency))
+
+
+def _is_daemon_process() -> bool:
+    """True inside daemonic processes (e.g. billiard's prefork children), which can't have children"""
+    if multiprocessing.current_process().daemon:
+        return True
+    
+    try:
+        from billiard.process import current_process as billiard_current_process
+    except ImportError:
+        return False
+    
+    return bool(billiard_current_process().daemon)
+
+
+def use_pdf_pool(page_count: int) -> bool:
+    """Whether a document of page_count pages should be split across the pool"""
+    workers = pdf_pool_workers()
+    return (
+        workers > 1
+        and page_count >= workers * MIN_PAGES_PER_WORKER
+        and not _is_daemon_process()
+    )
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Return this process's pool, creating it on first use"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: pool processes are forked from a clean server process, so they
+            # don't inherit this process's DB/Redis connections or background threads
+            workers = pdf_pool_workers()
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+            logger.info(f"🧵 PDF extraction pool started ({workers} processes)")
+        return _pool
+
+
+def extract_page_ranges(
+    extract_range: Callable[[str, int, int], List],
+    file_path: str,
+    page_count: int
+) -> List:
+    """
+    Run extract_range(file_path, start, stop) over contiguous page ranges in the pool
+    and return the per-page results in page order.
+    If the pool can't be started or fails, the whole document is extracted in-process.
+    extract_range must be a module-level function (it is pickled by reference).
+    """
+    chunk = -(-page_count // pdf_pool_workers())
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+
+    try:
+        pool = _get_pdf_pool()
+        futures = [pool.submit(extract_range, file_path, start, stop) for start, stop in ranges]
+        return [result for future in futures for result in future.result()]
+    except Exception as e:
+        # Start-up errors, a dead pool process (e.g. OOM on a huge page) or a page error:
+        # drop the pool (recreated on next use) and retry serially, which surfaces real page errors
+        logger.warning(f"⚠️ PDF extraction pool failed ({type(e).__name__}: {e}) - extracting serially")
+        shutdown_pdf_pool()
+        return extract_range(file_path, 0, page_count)
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop this process's pool (worker_process_shutdown / API shutdown)"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
@@ -1,69 +1,159 @@
 # python-service/app/domains/individual_processing/scheme_extractor.py
-from typing import List
+from typing import List, Optional, Set, Tuple
 from .schemas import SchemeTopic
-import pdfplumber
-from openpyxl import load_workbook
+from .extraction_cache import scheme_cache, file_sha256
+from .pdf_pool import extract_page_ranges, use_pdf_pool
+import fitz  # PyMuPDF
+from python_calamine import CalamineWorkbook
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
-def extract_scheme(file_url: str) -> List[SchemeTopic]:
+# Consecutive blank rows after which a sheet is considered finished
+MAX_EMPTY_ROWS = 5
+
+
+def extract_scheme(file_url: str) -> Tuple[List[SchemeTopic], Set[str], Set[int]]:
     """
     Extracts topics, subtopics, learning objectives from PDF or Excel.
+    Returns (topics, unique subject names, weeks covered), collected in the same pass.
     """
     logger.info(f"📄 Extracting scheme from: {file_url}")
     
     if file_url.endswith(".pdf"):
-        return _extract_scheme_pdf(file_url)
+        extract = _extract_scheme_pdf
     elif file_url.endswith(".xlsx") or file_url.endswith(".xls"):
-        return _extract_scheme_excel(file_url)
+        extract = _extract_scheme_excel
     else:
         raise ValueError(f"Unsupported file type: {file_url}")
+    
+    file_hash = file_sha256(file_url)
+    cached = scheme_cache.get(file_hash)
+    if cached is not None:
+        topics = [SchemeTopic.model_validate(t) for t in cached["topics"]]
+        return topics, set(cached["subjects"]), set(cached["weeks"])
+    
+    topics, subjects, weeks = extract(file_url)
+    if topics:
+        scheme_cache.set(file_hash, {
+            "topics": [t.model_dump() for t in topics],
+            "subjects": list(subjects),
+            "weeks": list(weeks)
+        })
+    
+    return topics, subjects, weeks
+
+
+def _extract_page_range(file_url: str, start: int, stop: int) -> List[str]:
+    """Extract text for pages [start, stop). Each worker opens its own document."""
+    with fitz.open(file_url) as doc:
+        return [doc.load_page(i).get_text("text") for i in range(start, stop)]
+
+
+def _extract_pdf_pages(file_url: str) -> List[str]:
+    """
+    Extract page texts in page order.
+    PyMuPDF documents can't be shared across threads, so large files are
+    split into contiguous page ranges and extracted in the shared PDF pool.
+    Inside Celery tasks (daemonic prefork workers) use_pdf_pool() is False and
+    pages are read here; pool failures also fall back to an in-process pass.
+    """
+    with fitz.open(file_url) as doc:
+        page_count = doc.page_count
+        if not use_pdf_pool(page_count):
+            return [page.get_text("text") for page in doc]
+    
+    return extract_page_ranges(_extract_page_range, file_url, page_count)
 
 
-def _extract_scheme_pdf(file_url: str) -> List[SchemeTopic]:
+def _parse_scheme_line(line: str) -> Optional[Tuple[int, str, str, List[str], Optional[List[str]]]]:
+    """
+    Tokenize one "Week Topic | Subject | Subtopics | Objectives" line.
+    Returns (week, topic, subject, subtopics, objectives) or None if the line isn't a topic row.
+    """
+    # Cheap prefilter: topic rows start with the week number
+    if not line[:1].isdigit():
+        return None
+    
+    head, sep, rest = line.partition("|")
+    if not sep:
+        return None
+    
+    week_str, space, topic = head.partition(" ")
+    # "1st Term | ..." or "1. Algebra | ..." start with a digit but aren't topic rows
+    if not week_str.isdecimal():
+        return None
+    week = int(week_str)
+    if not space:
+        topic = "Unknown"
+    
+    subject, sep_subtopics, rest = rest.partition("|")
+    subtopics_str, sep_objectives, rest = rest.partition("|")
+    objectives_str = rest.partition("|")[0]
+    
+    subtopics = subtopics_str.split(",") if sep_subtopics else []
+    objectives = objectives_str.split(",") if sep_objectives else None
+    return week, topic, subject.strip(), subtopics, objectives
+
+
+def _extract_scheme_pdf(file_url: str) -> Tuple[List[SchemeTopic], Set[str], Set[int]]:
     topics = []
-    with pdfplumber.open(file_url) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            for line in text.split("\n"):
-                if line.strip():
-                    # naive: "Week Topic | Subject | Subtopics | Objectives"
-                    parts = line.split("|")
-                    if len(parts) >= 2:
-                        week_topic = parts[0].split(" ", 1)
-                        week = int(week_topic[0])
-                        topic = week_topic[1] if len(week_topic) > 1 else "Unknown"
-                        subject = parts[1].strip() if len(parts) > 1 else "Unknown Subject"
-                        subtopics = parts[2].split(",") if len(parts) > 2 else []
-                        objectives = parts[3].split(",") if len(parts) > 3 else None
-                        
-                        topics.append(SchemeTopic(
-                            week_number=week,  # ✅ Use week_number (not week)
-                            topic=topic,
-                            subject=subject,  # ✅ Required field
-                            subtopics=subtopics,
-                            objectives=objectives  # ✅ Use objectives (not learning_objectives)
-                        ))
+    subjects = set()
+    weeks = set()
+    for text in _extract_pdf_pages(file_url):
+        for line in text.split("\n"):
+            # naive: "Week Topic | Subject | Subtopics | Objectives"
+            parsed = _parse_scheme_line(line)
+            if parsed:
+                week, topic, subject, subtopics, objectives = parsed
+                subjects.add(subject)
+                if week:
+                    weeks.add(week)
+                # Values are already typed here, so skip re-validation
+                topics.append(SchemeTopic.model_construct(
+                    week_number=week,  # ✅ Use week_number (not week)
+                    topic=topic,
+                    subject=subject,  # ✅ Required field
+                    subtopics=subtopics,
+                    objectives=objectives  # ✅ Use objectives (not learning_objectives)
+                ))
     
     logger.info(f"✅ Extracted {len(topics)} topics from PDF")
-    return topics
+    return topics, subjects, weeks
 
 
-def _extract_scheme_excel(file_url: str) -> List[SchemeTopic]:
+def _extract_scheme_excel(file_url: str) -> Tuple[List[SchemeTopic], Set[str], Set[int]]:
     topics = []
-    wb = load_workbook(filename=file_url)
-    for sheet in wb.worksheets:
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            # Expected columns: Week | Topic | Subject | Subtopics | Objectives
+    subjects = set()
+    weeks = set()
+    # calamine parses the workbook natively and hands back plain Python rows
+    wb = CalamineWorkbook.from_path(file_url)
+    for sheet_index in range(len(wb.sheet_names)):
+        rows = wb.get_sheet_by_index(sheet_index).to_python(skip_empty_area=True)
+        empty_streak = 0
+        # Expected columns: Week | Topic | Subject | Subtopics | Objectives
+        for row in rows[1:]:
+            row = row[:5]
+            if not any(row):
+                # Stop on inflated dimensions (e.g. A1:BK1048501) full of phantom rows
+                empty_streak += 1
+                if empty_streak >= MAX_EMPTY_ROWS:
+                    break
+                continue
+            empty_streak = 0
+            
             if len(row) >= 3:
                 week = int(row[0])
                 topic = str(row[1])
                 subject = str(row[2]) if row[2] else "Unknown Subject"
                 subtopics = row[3].split(",") if len(row) > 3 and row[3] else []
                 objectives = row[4].split(",") if len(row) > 4 and row[4] else None
+                subjects.add(subject)
+                if week:
+                    weeks.add(week)
                 
-                topics.append(SchemeTopic(
+                # Values are already typed here, so skip re-validation
+                topics.append(SchemeTopic.model_construct(
                     week_number=week,  # ✅ Use week_number
                     topic=topic,
                     subject=subject,  # ✅ Required field
@@ -71,6 +161,5 @@ def _extract_scheme_excel(file_url: str) -> List[SchemeTopic]:
                     objectives=objectives  # ✅ Use objectives
                 ))
     
-    wb.close()
     logger.info(f"✅ Extracted {len(topics)} topics from Excel")
-    return topics
\ No newline at end of file
+    return topics, subjects, weeks
\ No newline at end of file
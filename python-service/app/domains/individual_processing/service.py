@@ -2,9 +2,11 @@
 app/domains/individual_processing/service.py
 FIXED: Ensures class_id is passed to subject mapper
 """
-import os
+import asyncio
 import httpx
-from typing import List
+import numpy as np
+import orjson
+from typing import List, Optional, Set, Coroutine
 from sqlalchemy.orm import Session
 
 from app.core.logger import get_logger
@@ -13,15 +15,22 @@ from app.domains.individual_processing import schemas, timetable_extractor, sche
 
 logger = get_logger(__name__)
 
-# Get Java API URL
-JAVA_API_URL = os.getenv("JAVA_API_URL", "http://java-service:8080/api/v1/lesson-topics")
-if "/api/v1" in JAVA_API_URL:
-    JAVA_API_URL = JAVA_API_URL.split("/api/v1")[0] + "/api/v1"
-else:
-    JAVA_API_URL = "http://java-service:8080/api/v1"
-    
+# Java API URL (normalized once in settings)
+JAVA_API_URL = settings.JAVA_API_URL
+
+# Callback URL templates, filled with .format(record_id)
+TIMETABLE_STATUS_URL = JAVA_API_URL + "/individual/callback/timetable/{}/status"
+SCHEME_STATUS_URL = JAVA_API_URL + "/individual/callback/scheme/{}/status"
+
 logger.info(f"🔗 Java API base URL: {JAVA_API_URL}")
 
+# Shared keep-alive client for Java callbacks (see _get_http_client)
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Strong references to callbacks running in the background (see _dispatch_callback)
+_background_callbacks: Set[asyncio.Task] = set()
+
 
 async def process_timetable(
     request: schemas.TimetableUploadRequest,
@@ -47,14 +56,13 @@ async def process_timetable(
         await _update_timetable_status(request.timetable_id, "PROCESSING")
         
         # Extract timetable entries
-        entries = timetable_extractor.extract_timetable(request.file_url)
+        entries, subjects = timetable_extractor.extract_timetable(request.file_url)
         
         if not entries:
             raise ValueError("No timetable entries found in document")
         
-        # ✅ NEW: Validate timetable and detect conflicts
-        from app.domains.individual_processing.timetable_extractor import validate_timetable
-        is_valid, conflicts = validate_timetable(entries)
+        # ✅ NEW: Validate timetable and detect conflicts (reused by the completion callback)
+        is_valid, conflicts = timetable_extractor.validate_timetable(entries)
         
         if conflicts:
             logger.warning(f"⚠️ Timetable has {len(conflicts)} conflicts detected")
@@ -62,8 +70,8 @@ async def process_timetable(
             if high_severity:
                 logger.error(f"❌ {len(high_severity)} HIGH severity conflicts found")
         
-        # Extract unique subjects
-        unique_subjects = list(set(entry.subject for entry in entries))
+        # Unique subjects are collected by the extractor
+        unique_subjects = list(subjects)
         logger.info(f"📚 Extracted {len(unique_subjects)} unique subjects: {unique_subjects}")
         
         # ✅ CRITICAL FIX: Pass class_id to subject mapper
@@ -94,14 +102,16 @@ async def process_timetable(
         )
         
         # Update Java database with results INCLUDING entries AND conflicts
-        await _update_timetable_completion(
+        # (sent in the background so the caller gets the result without waiting on Java)
+        _dispatch_callback(_update_timetable_completion(
             request.timetable_id,
             len(entries),
             len(mapping_result.matched_subjects),
             result.confidence_score,
             entries,
-            mapping_result
-        )
+            mapping_result,
+            conflicts
+        ))
         
         logger.info(
             f"✅ Timetable processing completed: "
@@ -133,12 +143,12 @@ async def process_scheme(
     try:
         await _update_scheme_status(request.scheme_id, "PROCESSING")
         
-        topics = scheme_extractor.extract_scheme(request.file_url)
+        topics, subjects, weeks = scheme_extractor.extract_scheme(request.file_url)
         
         if not topics:
             raise ValueError("No topics found in scheme document")
         
-        unique_subjects = list(set(topic.subject for topic in topics))
+        unique_subjects = list(subjects)
         logger.info(f"📚 Extracted {len(unique_subjects)} unique subjects")
         
         mapping_result = subject_mapper.map_subjects(
@@ -158,7 +168,7 @@ async def process_scheme(
             student_id=request.student_id,
             subject_id=request.subject_id,
             total_topics_extracted=len(topics),
-            weeks_covered=_count_weeks(topics),
+            weeks_covered=len(weeks),
             topics=topics,
             subject_mapping=mapping_result,
             confidence_score=_calculate_confidence(topics, mapping_result)
@@ -203,19 +213,85 @@ async def map_subjects(
 # JAVA API CALLBACKS
 # ============================================================
 
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared Java callback client, reusing its connection pool.
+    Celery workers keep one event loop per process, so the client (and its
+    keep-alive connections) survives across tasks; it is only recreated
+    if the running loop changes.
+    """
+    global _http_client, _http_client_loop
+    
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=10)
+        )
+        _http_client_loop = loop
+    
+    return _http_client
+
+
+async def _post_json(url: str, payload: dict) -> httpx.Response:
+    """POST a payload to the Java API, serialized with orjson"""
+    response = await _get_http_client().post(
+        url,
+        content=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"}
+    )
+    response.raise_for_status()
+    return response
+
+
+def _dispatch_callback(callback: Coroutine) -> asyncio.Task:
+    """Run a Java callback in the background without blocking the caller"""
+    task = asyncio.create_task(callback)
+    _background_callbacks.add(task)
+    task.add_done_callback(_on_callback_done)
+    return task
+
+
+def _on_callback_done(task: asyncio.Task):
+    _background_callbacks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"❌ Background callback failed: {task.exception()}")
+
+
+async def wait_for_background_callbacks():
+    """
+    Wait for in-flight background callbacks.
+    The worker loop only runs while a task is executing, so Celery tasks must
+    call this before returning or their callbacks stall until the next task.
+    """
+    if _background_callbacks:
+        await asyncio.gather(*_background_callbacks, return_exceptions=True)
+
+
+async def close_http_client():
+    """Close the shared Java callback client (called on app shutdown)"""
+    global _http_client, _http_client_loop
+    
+    await wait_for_background_callbacks()
+    
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    
+    _http_client = None
+    _http_client_loop = None
+
+
 async def _update_timetable_status(timetable_id: int, status: str, error: str = None):
     """Call Java API to update timetable processing status"""
     try:
-        url = f"{JAVA_API_URL}/individual/callback/timetable/{timetable_id}/status"
+        url = TIMETABLE_STATUS_URL.format(timetable_id)
         
         payload = {
             "status": status,
             "error": error
         }
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
+        await _post_json(url, payload)
             
         logger.info(f"✅ Updated timetable {timetable_id} status to: {status}")
         
@@ -229,46 +305,43 @@ async def _update_timetable_completion(
     subjects_count: int,
     confidence: float,
     entries: List[schemas.TimetableEntry],
-    mapping_result: schemas.SubjectMappingResult
+    mapping_result: schemas.SubjectMappingResult,
+    conflicts: List[timetable_extractor.Conflict]
 ):
     """
     Call Java API to update timetable extraction results WITH entries AND conflicts
     ✅ SPRINT 9: Now includes conflict detection results
+    Takes the conflicts already detected by process_timetable instead of re-validating.
     """
     try:
-        url = f"{JAVA_API_URL}/individual/callback/timetable/{timetable_id}/status"
+        url = TIMETABLE_STATUS_URL.format(timetable_id)
+        
+        # Index subject mappings by name (first match wins, as before)
+        subject_index = {}
+        for match in mapping_result.matched_subjects:
+            subject_index.setdefault(
+                match.extracted_name.casefold(),
+                (match.platform_subject_id, match.confidence)
+            )
         
         # Convert entries to JSON format
-        entries_json = []
-        for entry in entries:
-            # Find subject mapping
-            subject_id = None
-            mapping_confidence = None
-            
-            for match in mapping_result.matched_subjects:
-                if match.extracted_name.lower() == entry.subject.lower():
-                    subject_id = match.platform_subject_id
-                    mapping_confidence = match.confidence
-                    break
-            
-            entry_dict = {
+        no_mapping = (None, None)
+        entries_json = [
+            {
                 "dayOfWeek": entry.day.upper(),
                 "periodNumber": entry.period_number,
                 "startTime": entry.start_time,
                 "endTime": entry.end_time,
                 "subjectName": entry.subject,
-                "subjectId": subject_id,
-                "mappingConfidence": mapping_confidence,
-                "room": entry.room if hasattr(entry, 'room') else None,
-                "teacher": entry.teacher if hasattr(entry, 'teacher') else None
+                "subjectId": (mapping := subject_index.get(entry.subject.casefold(), no_mapping))[0],
+                "mappingConfidence": mapping[1],
+                "room": entry.room,
+                "teacher": entry.teacher
             }
-            entries_json.append(entry_dict)
-        
-        # ✅ NEW: Detect conflicts in extracted timetable
-        from app.domains.individual_processing.timetable_extractor import validate_timetable
-        
-        is_valid, conflicts = validate_timetable(entries)
+            for entry in entries
+        ]
         
+        # Conflicts were already detected in process_timetable
         conflicts_json = []
         if conflicts:
             logger.warning(f"⚠️ Detected {len(conflicts)} conflicts in timetable")
@@ -287,9 +360,7 @@ async def _update_timetable_completion(
         
         logger.info(f"📤 Sending {len(entries_json)} entries and {len(conflicts_json)} conflicts to Java API")
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
+        await _post_json(url, payload)
             
         logger.info(f"✅ Updated timetable {timetable_id} completion results with {len(entries_json)} entries")
         
@@ -300,16 +371,14 @@ async def _update_timetable_completion(
 async def _update_scheme_status(scheme_id: int, status: str, error: str = None):
     """Call Java API to update scheme processing status"""
     try:
-        url = f"{JAVA_API_URL}/individual/callback/scheme/{scheme_id}/status"
+        url = SCHEME_STATUS_URL.format(scheme_id)
         
         payload = {
             "status": status,
             "error": error
         }
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
+        await _post_json(url, payload)
             
         logger.info(f"✅ Updated scheme {scheme_id} status to: {status}")
         
@@ -325,7 +394,7 @@ async def _update_scheme_completion(
 ):
     """Call Java API to update scheme extraction results"""
     try:
-        url = f"{JAVA_API_URL}/individual/callback/scheme/{scheme_id}/status"
+        url = SCHEME_STATUS_URL.format(scheme_id)
         
         payload = {
             "status": "COMPLETED",
@@ -334,9 +403,7 @@ async def _update_scheme_completion(
             "confidence": confidence
         }
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
+        await _post_json(url, payload)
             
         logger.info(f"✅ Updated scheme {scheme_id} completion results")
         
@@ -361,16 +428,10 @@ def _calculate_confidence(entries: List, mapping_result: schemas.SubjectMappingR
     mapping_rate = len(mapping_result.matched_subjects) / total_subjects
     
     # Average subject mapping confidence
-    if mapping_result.matched_subjects:
-        avg_match_confidence = sum(m.confidence for m in mapping_result.matched_subjects) / len(mapping_result.matched_subjects)
-    else:
-        avg_match_confidence = 0.0
+    matched = mapping_result.matched_subjects
+    confidences = np.fromiter((m.confidence for m in matched), dtype=np.float64, count=len(matched))
+    avg_match_confidence = float(confidences.mean()) if confidences.size else 0.0
     
     # Combined score
     return (mapping_rate * 0.5 + avg_match_confidence * 0.5)
 
-
-def _count_weeks(topics: List[schemas.SchemeTopic]) -> int:
-    """Count unique weeks in scheme topics"""
-    weeks = set(topic.week_number for topic in topics if topic.week_number)
-    return len(weeks)
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+app/domains/individual_processing/subject_catalog.py
+Process-wide snapshot of the platform subject catalog used by subject_mapper.
+The catalog is small and slow-changing, so it is loaded once and only rebuilt
+when the subjects table's content hash changes (or the snapshot gets too old).
+Subjects are written by the Java service, so there is no in-process write path
+to invalidate from; the periodic hash check bounds staleness instead.
+"""
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+from app.models.subject import Subject
+
+logger = get_logger(__name__)
+
+GENERAL_DEPARTMENT_ID = 4  # General subjects are shared across a grade
+
+# How long a snapshot is trusted before the version token is re-checked
+CATALOG_CHECK_INTERVAL = 60  # seconds
+# Snapshots older than this are reloaded even if the version token is unchanged
+CATALOG_MAX_AGE = 3600  # seconds
+
+# Hash of every subjects row (whole-row text, so edits to any column change it)
+_CATALOG_VERSION_SQL = text(
+    "SELECT md5(string_agg(s::text, ',' ORDER BY s.id)) "
+    f"FROM {Subject.__table__.fullname} s"
+)
+
+# Parenthesised notes and level/grade/department qualifiers stripped by extract_base_subject.
+# Case-sensitive on purpose: only the as-written and all-lowercase spellings are modifiers
+# (so 'Home Economics' and 'Music ART' keep their words).
+_MODIFIER_RE = re.compile(
+    r'\(.*?\)'
+    r'|(?:SSS|JSS|sss|jss)[123]'
+    r'|Individual|individual'
+    r'| (?:General|general|Science|science|Commercial|commercial|Art|art|HOME|home'
+    r'|ASPIRANT|aspirant|Revision|revision|Practical|practical)\b'
+)
+
+
+def _modifier_replacement(match: re.Match) -> str:
+    """Parenthesised notes are dropped outright, other modifiers leave a word break"""
+    return '' if match.group().startswith('(') else ' '
+
+
+@lru_cache(maxsize=4096)
+def extract_base_subject(subject_name: str) -> str:
+    """
+    Extract base subject name, removing level/grade modifiers.
+    
+    Examples:
+        "Mathematics SSS1 General" → "Mathematics"
+        "English Language SSS2 Science Individual" → "English Language"
+        "Economics (Revision)" → "Economics"
+    """
+    if not subject_name:
+        return ""
+    
+    return ' '.join(_MODIFIER_RE.sub(_modifier_replacement, subject_name).split())
+
+
+class SubjectRecord(NamedTuple):
+    """Detached, read-only copy of a Subject row (safe to share across sessions)"""
+    id: int
+    name: str
+    code: Optional[str]
+    level: Optional[str]
+    grade: Optional[str]
+    compulsory: Optional[bool]
+    department_id: Optional[int]
+    class_id: Optional[int]
+    is_individual: bool
+    # Pre-normalized once per snapshot for fuzzy matching
+    name_lower: str
+    code_lower: str
+    base_lower: str  # extract_base_subject(name).lower()
+
+
+class SubjectCatalog:
+    """Subject list plus the lookups map_subjects needs for its priority pools"""
+
+    def __init__(self, version: Optional[str], subjects: List[SubjectRecord]):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.checked_at = self.loaded_at
+        self.all = subjects
+        self.individual: List[SubjectRecord] = []
+        self.grade_of_class: Dict[int, str] = {}
+        self.individual_by_class: Dict[int, List[SubjectRecord]] = {}
+        self.general_individual_by_grade: Dict[str, List[SubjectRecord]] = {}
+        level_positions: Dict[str, List[int]] = {'SSS': [], 'JSS': []}
+
+        for subject in subjects:
+            if subject.class_id is not None and subject.grade:
+                self.grade_of_class.setdefault(subject.class_id, subject.grade)
+
+            if not subject.is_individual:
+                continue
+
+            position = len(self.individual)
+            self.individual.append(subject)
+
+            if subject.class_id is not None:
+                self.individual_by_class.setdefault(subject.class_id, []).append(subject)
+
+            if subject.department_id == GENERAL_DEPARTMENT_ID and subject.grade:
+                self.general_individual_by_grade.setdefault(subject.grade, []).append(subject)
+
+            name_upper = subject.name.upper()
+            for level, positions in level_positions.items():
+                if level in name_upper:
+                    positions.append(position)
+
+        # Level pools as column indices into self.individual (and any matrix scored against it)
+        self.individual_level_columns: Dict[str, np.ndarray] = {
+            level: np.array(positions, dtype=np.intp)
+            for level, positions in level_positions.items()
+        }
+        self.individual_by_level: Dict[str, List[SubjectRecord]] = {
+            level: [self.individual[i] for i in positions]
+            for level, positions in level_positions.items()
+        }
+
+
+_catalog: Optional[SubjectCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def catalog_version(db: Session) -> Optional[str]:
+    """Change token for the subjects table: md5 over the content of every row"""
+    return db.execute(_CATALOG_VERSION_SQL).scalar()
+
+
+def get_catalog(db: Session) -> SubjectCatalog:
+    """
+    Return the current catalog snapshot, rebuilding it if the table changed.
+    The version token is only queried once per CATALOG_CHECK_INTERVAL, and a
+    snapshot older than CATALOG_MAX_AGE is always rebuilt.
+    """
+    global _catalog
+
+    now = time.monotonic()
+    catalog = _catalog
+    expired = catalog is None or now - catalog.loaded_at >= CATALOG_MAX_AGE
+    if not expired and now - catalog.checked_at < CATALOG_CHECK_INTERVAL:
+        return catalog
+
+    version = catalog_version(db)
+    if not expired and catalog.version == version:
+        catalog.checked_at = now
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is catalog:
+            subjects = [
+                SubjectRecord(
+                    id=s.id,
+                    name=s.name,
+                    code=s.code,
+                    level=s.level,
+                    grade=s.grade,
+                    compulsory=s.compulsory,
+                    department_id=s.department_id,
+                    class_id=s.class_id,
+                    is_individual=bool(s.is_individual),
+                    name_lower=s.name.lower().strip(),
+                    code_lower=(s.code or '').lower().strip(),
+                    base_lower=extract_base_subject(s.name).lower()
+                )
+                for s in db.query(
+                    Subject.id,
+                    Subject.name,
+                    Subject.code,
+                    Subject.level,
+                    Subject.grade,
+                    Subject.compulsory,
+                    Subject.department_id,
+                    Subject.class_id,
+                    Subject.is_individual
+                ).order_by(Subject.id).all()
+            ]
+            _catalog = SubjectCatalog(version, subjects)
+            logger.info(f"📚 Subject catalog loaded: {len(subjects)} subjects ({len(_catalog.individual)} Individual)")
+
+        return _catalog
+
+
+def invalidate_catalog() -> None:
+    """
+    Force the next get_catalog() call to reload from the database.
+    The new snapshot also makes subject_mapper drop its cached mapping results.
+    """
+    global _catalog
+    _catalog = None
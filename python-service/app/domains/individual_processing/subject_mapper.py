@@ -3,12 +3,22 @@ app/domains/individual_processing/subject_mapper.py
 ✅ UPDATED: Rejects low-confidence subjects instead of fallback
 Only accepts high-confidence matches (≥70% or ≥85%)
 """
-from typing import List, Dict, Tuple, Optional
+from collections import OrderedDict
+from functools import lru_cache
+import logging
 import re
+from typing import List, Dict, Tuple, Optional
+import numpy as np
 from sqlalchemy.orm import Session
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 from app.core.logger import get_logger
 from app.domains.individual_processing import schemas
+from app.domains.individual_processing.subject_catalog import (
+    SubjectCatalog,
+    SubjectRecord,
+    extract_base_subject,
+    get_catalog
+)
 from app.models.subject import Subject
 
 logger = get_logger(__name__)
@@ -17,6 +27,50 @@ logger = get_logger(__name__)
 CONFIDENCE_THRESHOLD = 70.0  # Minimum confidence to accept (70% or 85%, your choice)
 MIN_MATCH_SCORE = 70.0  # Consistent with threshold
 
+# Scorers behind _calculate_match_scores, in score-array order
+STRATEGY_NAMES = ('exact', 'partial', 'token_sort', 'token_set', 'base_exact', 'base_partial')
+
+# Score boosts for the priority pools (class/grade and level pools vs all Individual subjects)
+PRIORITY_BOOST = 1.15
+FALLBACK_BOOST = 1.10
+
+# Subject groups that should NOT be matched to each other (substring match on base names)
+_SUBJECT_GROUPS: Tuple[frozenset, ...] = (
+    frozenset({"math", "mathematics", "further math", "further maths"}),
+    frozenset({"english", "literature", "english language"}),
+    frozenset({"physics", "chemistry", "biology"}),
+    frozenset({"geography", "economics", "government", "civic"}),
+    frozenset({"commerce", "accounting", "financial accounting"}),
+    frozenset({"history", "christian religious studies", "islamic studies"}),
+)
+
+# One compiled alternation per group, so membership is a single C-level scan per group
+_GROUP_PATTERNS: Tuple[re.Pattern, ...] = tuple(
+    re.compile('|'.join(re.escape(term) for term in sorted(group, key=len, reverse=True)))
+    for group in _SUBJECT_GROUPS
+)
+
+# Keyword in the extracted base -> terms the platform base must contain one of
+_CRITICAL_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("math", ("math",)),
+    ("english", ("english", "literature")),
+    ("physics", ("physics",)),
+    ("chemistry", ("chemistry", "chem")),
+    ("biology", ("biology", "bio")),
+    ("geography", ("geography", "geo")),
+    ("economics", ("economics", "econ")),
+    ("commerce", ("commerce",)),
+    ("accounting", ("accounting",)),
+    ("government", ("government", "gov")),
+    ("civic", ("civic",)),
+    ("literature", ("literature", "english")),
+)
+
+# Process-level cache of mapping results, keyed on inputs + catalog version
+MAPPING_CACHE_SIZE = 256
+_mapping_cache: "OrderedDict[tuple, schemas.SubjectMappingResult]" = OrderedDict()
+_mapping_cache_catalog: Optional[SubjectCatalog] = None  # snapshot the cached results came from
+
 
 def map_subjects(
     extracted_subjects: List[str],
@@ -30,7 +84,66 @@ def map_subjects(
     Low-confidence subjects are REJECTED and not included.
     
     Returns fewer subjects with 100% accuracy rather than all subjects with errors.
+    Results are cached per process until the subject catalog changes. The cache key
+    uses the sorted names (callers build the list from a set), and results come back
+    in the caller's order.
     """
+    global _mapping_cache_catalog
+    
+    catalog = get_catalog(db)
+    if catalog is not _mapping_cache_catalog:
+        # Any catalog reload (changed table, max age, invalidate_catalog) drops old results
+        clear_mapping_cache()
+        _mapping_cache_catalog = catalog
+    
+    # Each name is mapped independently, so mapping the sorted list loses nothing
+    sorted_subjects = sorted(extracted_subjects)
+    cache_key = (tuple(sorted_subjects), is_individual, class_id, catalog.version)
+    
+    result = _mapping_cache.get(cache_key)
+    if result is not None:
+        _mapping_cache.move_to_end(cache_key)
+        logger.info(f"♻️ Subject mapping cache hit ({len(extracted_subjects)} subjects, class_id: {class_id})")
+    else:
+        result = _map_subjects(sorted_subjects, db, catalog, is_individual, class_id)
+        _mapping_cache[cache_key] = result
+        if len(_mapping_cache) > MAPPING_CACHE_SIZE:
+            _mapping_cache.popitem(last=False)
+    
+    return _in_caller_order(result, extracted_subjects)
+
+
+def _in_caller_order(
+    result: schemas.SubjectMappingResult,
+    extracted_subjects: List[str]
+) -> schemas.SubjectMappingResult:
+    """Copy of a (cached) result with matches and rejects ordered like extracted_subjects"""
+    position: Dict[str, int] = {}
+    for i, name in enumerate(extracted_subjects):
+        position.setdefault(name, i)
+    
+    return schemas.SubjectMappingResult(
+        matched_subjects=[
+            match.model_copy()
+            for match in sorted(result.matched_subjects, key=lambda m: position[m.extracted_name])
+        ],
+        unmatched_subjects=sorted(result.unmatched_subjects, key=position.__getitem__)
+    )
+
+
+def clear_mapping_cache() -> None:
+    """Drop cached mapping results (done automatically whenever the catalog is reloaded)"""
+    _mapping_cache.clear()
+
+
+def _map_subjects(
+    extracted_subjects: List[str],
+    db: Session,
+    catalog: SubjectCatalog,
+    is_individual: bool,
+    class_id: Optional[int]
+) -> schemas.SubjectMappingResult:
+    """Uncached mapping: tries each subject pool in priority order"""
     logger.info(
         f"🔍 [REJECT MODE] Mapping {len(extracted_subjects)} subjects "
         f"(individual: {is_individual}, class_id: {class_id})"
@@ -39,38 +152,28 @@ def map_subjects(
     if not class_id:
         logger.warning("⚠️ class_id is None! Java service should send class_id in request.")
     
-    # Get all platform subjects
-    all_subjects = db.query(Subject).all()
-    logger.info(f"📊 Total platform subjects: {len(all_subjects)}")
+    # Normalize extracted names once for every pool pass below
+    normalized = _normalize_names(extracted_subjects)
     
     # Get the student's grade
     student_grade = None
     if class_id:
-        student_class = db.query(Subject).filter(Subject.class_id == class_id).first()
-        if student_class:
-            student_grade = student_class.grade
+        student_grade = catalog.grade_of_class.get(class_id)
+        if student_grade:
             logger.info(f"📚 Student grade: {student_grade}")
     
     # PRIORITY 1: Individual subjects in the same class + General Individual subjects
     if is_individual and class_id and student_grade:
-        individual_class_subjects = [
-            s for s in all_subjects 
-            if 'Individual' in s.name 
-            and s.class_id == class_id
-        ]
-        
-        general_individual_subjects = [
-            s for s in all_subjects
-            if 'Individual' in s.name
-            and s.grade == student_grade
-            and s.department_id == 4
-        ]
+        individual_class_subjects = catalog.individual_by_class.get(class_id, [])
+        general_individual_subjects = catalog.general_individual_by_grade.get(student_grade, [])
         
         combined_subjects = individual_class_subjects + general_individual_subjects
         
-        logger.info(f"📊 Individual subjects in class {class_id}: {len(individual_class_subjects)}")
-        logger.info(f"📊 General Individual subjects in grade {student_grade}: {len(general_individual_subjects)}")
-        logger.info(f"📊 Total available subjects: {len(combined_subjects)}")
+        logger.info(
+            f"📊 Available subjects: {len(combined_subjects)} "
+            f"({len(individual_class_subjects)} Individual in class {class_id}, "
+            f"{len(general_individual_subjects)} General Individual in grade {student_grade})"
+        )
         
         if combined_subjects:
             result = _map_with_rejection(
@@ -80,7 +183,8 @@ def map_subjects(
                 student_grade,
                 class_id,
                 filter_description=f"Individual subjects (class {class_id} + General {student_grade})",
-                boost_factor=1.15
+                boost_factor=PRIORITY_BOOST,
+                normalized=normalized
             )
             
             if result.matched_subjects:
@@ -92,7 +196,8 @@ def map_subjects(
     
     # PRIORITY 2: All Individual subjects filtered by level
     if is_individual:
-        individual_subjects = [s for s in all_subjects if 'Individual' in s.name]
+        individual_subjects = catalog.individual
+        level_scores = None  # level pool's raw scores, reused if we fall through to all Individual subjects
         
         # Infer level (SSS vs JSS)
         level_filter = None
@@ -115,13 +220,11 @@ def map_subjects(
                 logger.info("🔍 Defaulting to SSS level")
         
         if level_filter:
-            individual_subjects_filtered = [
-                s for s in individual_subjects 
-                if level_filter in s.name.upper()
-            ]
+            individual_subjects_filtered = catalog.individual_by_level[level_filter]
             logger.info(f"📊 Individual {level_filter} subjects: {len(individual_subjects_filtered)}")
             
             if individual_subjects_filtered:
+                level_scores = _raw_scores(normalized, individual_subjects_filtered, PRIORITY_BOOST)
                 result = _map_with_rejection(
                     extracted_subjects,
                     individual_subjects_filtered,
@@ -129,7 +232,9 @@ def map_subjects(
                     student_grade,
                     class_id,
                     filter_description=f"Individual {level_filter} subjects",
-                    boost_factor=1.15
+                    boost_factor=PRIORITY_BOOST,
+                    normalized=normalized,
+                    raw_scores=level_scores
                 )
                 
                 if result.matched_subjects:
@@ -150,7 +255,9 @@ def map_subjects(
                 student_grade,
                 class_id,
                 filter_description="All Individual subjects",
-                boost_factor=1.10
+                boost_factor=FALLBACK_BOOST,
+                normalized=normalized,
+                raw_scores=_extend_level_scores(normalized, catalog, level_filter, level_scores)
             )
             
             if result.matched_subjects:
@@ -170,16 +277,22 @@ def map_subjects(
 
 def _map_with_rejection(
     extracted_subjects: List[str],
-    platform_subjects: List[Subject],
+    platform_subjects: List[SubjectRecord],
     db: Session,
     student_grade: Optional[str],
     class_id: Optional[int],
     filter_description: str,
-    boost_factor: float = 1.0
+    boost_factor: float = 1.0,
+    normalized: Optional[Tuple[List[str], List[str]]] = None,
+    raw_scores: Optional[Tuple[np.ndarray, np.ndarray]] = None
 ) -> schemas.SubjectMappingResult:
     """
     ✅ UPDATED: Only accepts high-confidence matches (≥70%).
     Low-confidence subjects are completely REJECTED.
+    
+    normalized: optional _normalize_names() result for extracted_subjects.
+    raw_scores: optional unboosted (direct, base) matrices from _raw_scores for this pool,
+    so overlapping pools don't re-score the same pairs.
     """
     if not platform_subjects:
         logger.warning("⚠️ No platform subjects to map against")
@@ -193,88 +306,140 @@ def _map_with_rejection(
     accepted_matches = []
     rejected_subjects = []
     
-    for extracted_name in extracted_subjects:
-        best_match = None
-        best_score = 0.0
-        best_strategy = ""
+    # Normalize each name once, not once per pair
+    extracted_lowers, extracted_bases = normalized or _normalize_names(extracted_subjects)
+    platform_lowers = [s.name_lower for s in platform_subjects]
+    platform_bases = [s.base_lower for s in platform_subjects]
+    
+    best_indices = np.zeros(len(extracted_subjects), dtype=np.intp)
+    best_scores = np.zeros(len(extracted_subjects), dtype=np.float64)
+    strategies: Dict[int, str] = {}  # rows resolved by anything other than the direct fuzzy match
+    
+    # Strategy 0: Exact name / base subject lookup (first subject wins, as in fuzzy ties)
+    exact_index: Dict[str, int] = {}
+    base_index: Dict[str, int] = {}
+    for j, (platform_lower, platform_base) in enumerate(zip(platform_lowers, platform_bases)):
+        exact_index.setdefault(platform_lower, j)
+        if platform_base:
+            base_index.setdefault(platform_base, j)
+    
+    fuzzy_rows = []
+    for i, (extracted_lower, extracted_base) in enumerate(zip(extracted_lowers, extracted_bases)):
+        if extracted_lower and extracted_lower in exact_index:
+            best_indices[i] = exact_index[extracted_lower]
+            strategies[i] = "exact_name"
+        elif extracted_base and extracted_base in base_index:
+            best_indices[i] = base_index[extracted_base]
+            strategies[i] = "exact_base"
+        else:
+            fuzzy_rows.append(i)
+            continue
+        best_scores[i] = 100.0
+    
+    # Strategy 1: Direct fuzzy matching for the rest, scored for all pairs in one batch
+    if fuzzy_rows:
+        if raw_scores is not None:
+            scores = raw_scores[0][fuzzy_rows]
+        else:
+            scores = _score_matrix(
+                [extracted_lowers[i] for i in fuzzy_rows],
+                platform_lowers,
+                [extracted_bases[i] for i in fuzzy_rows],
+                platform_bases,
+                score_cutoff=CONFIDENCE_THRESHOLD / max(boost_factor, 1.0)
+            )
         
-        # Strategy 1: Direct fuzzy matching
-        for platform_subject in platform_subjects:
-            scores = _calculate_match_scores(extracted_name, platform_subject.name)
-            score = max(scores.values())
-            
-            # Apply boost factor
-            if boost_factor > 1.0:
-                score = min(100.0, score * boost_factor)
-                scores['boosted'] = score
-            
-            if score > best_score:
-                best_score = score
-                best_match = platform_subject
-                best_strategy = max(scores, key=scores.get)
+        # Apply boost factor (scores is a fresh array here, so boost in place)
+        _apply_boost(scores, boost_factor)
         
-        # Strategy 2: Base subject matching
-        if best_score < CONFIDENCE_THRESHOLD:
-            base_match, base_score = _match_by_base_subject(
-                extracted_name,
-                platform_subjects,
-                boost_factor
-            )
-            
-            if base_score > best_score:
-                best_match = base_match
-                best_score = base_score
-                best_strategy = "base_subject"
+        row_best = scores.argmax(axis=1)
+        best_indices[fuzzy_rows] = row_best
+        best_scores[fuzzy_rows] = scores[np.arange(len(fuzzy_rows)), row_best]
+    
+    # Strategy 2: Base subject matching for every row still below threshold, in one batch
+    has_match = best_scores > 0
+    low_rows = np.flatnonzero(best_scores < CONFIDENCE_THRESHOLD)
+    if low_rows.size:
+        if raw_scores is not None:
+            base_raw = raw_scores[1][low_rows]
+        else:
+            base_raw = _base_score_matrix([extracted_bases[i] for i in low_rows], platform_bases)
         
-        # Strategy 3: Code matching
-        if best_score < CONFIDENCE_THRESHOLD and best_match and best_match.code:
-            code_score = fuzz.ratio(
-                extracted_name.lower().strip(),
-                best_match.code.lower().strip()
-            )
-            
-            if code_score * boost_factor > best_score:
-                best_score = min(100.0, code_score * boost_factor)
-                best_strategy = "code_match"
+        base_indices, base_scores = _match_by_base_subject(base_raw, boost_factor)
+        improved = base_scores > best_scores[low_rows]
+        improved_rows = low_rows[improved]
         
-        # ✅ DECISION: Accept or Reject
-        if best_match and best_score >= CONFIDENCE_THRESHOLD:
-            confidence_value = min(1.0, best_score / 100.0)
-            
+        best_indices[improved_rows] = base_indices[improved]
+        best_scores[improved_rows] = base_scores[improved]
+        has_match[improved_rows] = True
+        strategies.update((int(i), "base_subject") for i in improved_rows)
+    
+    # Strategy 3: Code matching on the current best candidate
+    for i in np.flatnonzero(has_match & (best_scores < CONFIDENCE_THRESHOLD)):
+        candidate = platform_subjects[best_indices[i]]
+        if not candidate.code:
+            continue
+        
+        code_score = fuzz.ratio(extracted_lowers[i], candidate.code_lower)
+        if code_score * boost_factor > best_scores[i]:
+            best_scores[i] = min(100.0, code_score * boost_factor)
+            strategies[int(i)] = "code_match"
+    
+    # ✅ DECISION: Accept or Reject (thresholding done on the whole vector)
+    passed = has_match & (best_scores >= CONFIDENCE_THRESHOLD)
+    confidences = np.minimum(1.0, best_scores / 100.0)
+    
+    # Per-subject detail only at DEBUG; INFO gets one summary per pass
+    verbose = logger.isEnabledFor(logging.DEBUG)
+    semantic_rejects = 0
+    
+    for i, extracted_name in enumerate(extracted_subjects):
+        best_score = float(best_scores[i])
+        best_match = platform_subjects[best_indices[i]] if has_match[i] else None
+        
+        if passed[i]:
             # Additional semantic validation
             if _validate_subject_match(extracted_name, best_match.name):
                 accepted_matches.append(schemas.SubjectMatch(
                     extracted_name=extracted_name,
                     platform_subject_id=best_match.id,
                     platform_subject_name=best_match.name,
-                    confidence=confidence_value
+                    confidence=float(confidences[i])
                 ))
                 
-                individual_marker = "🎯" if 'Individual' in best_match.name else ""
-                logger.info(
-                    f"✅ ACCEPTED {individual_marker} '{extracted_name}' → "
-                    f"'{best_match.name}' ({best_score:.1f}% via {best_strategy})"
-                )
+                if verbose:
+                    best_strategy = strategies.get(i) or _best_strategy(extracted_name, best_match.name, boost_factor)
+                    individual_marker = "🎯" if best_match.is_individual else ""
+                    logger.debug(
+                        f"✅ ACCEPTED {individual_marker} '{extracted_name}' → "
+                        f"'{best_match.name}' ({best_score:.1f}% via {best_strategy})"
+                    )
             else:
                 # Failed semantic validation - reject
                 rejected_subjects.append(extracted_name)
-                logger.warning(
-                    f"❌ REJECTED (semantic): '{extracted_name}' → '{best_match.name}' "
-                    f"({best_score:.1f}%)"
-                )
+                semantic_rejects += 1
+                if verbose:
+                    logger.debug(
+                        f"❌ REJECTED (semantic): '{extracted_name}' → '{best_match.name}' "
+                        f"({best_score:.1f}%)"
+                    )
         else:
             # Below confidence threshold - reject
             rejected_subjects.append(extracted_name)
-            best_match_name = best_match.name if best_match else "None"
-            logger.warning(
-                f"❌ REJECTED (low confidence): '{extracted_name}' → '{best_match_name}' "
-                f"({best_score:.1f}%)"
-            )
+            if verbose:
+                best_match_name = best_match.name if best_match else "None"
+                logger.debug(
+                    f"❌ REJECTED (low confidence): '{extracted_name}' → '{best_match_name}' "
+                    f"({best_score:.1f}%)"
+                )
     
     logger.info(
         f"📊 MAPPING RESULT: {len(accepted_matches)} accepted, "
-        f"{len(rejected_subjects)} rejected"
+        f"{len(rejected_subjects)} rejected ({semantic_rejects} semantic, "
+        f"{len(rejected_subjects) - semantic_rejects} low confidence)"
     )
+    if rejected_subjects:
+        logger.warning(f"❌ REJECTED: {', '.join(rejected_subjects)}")
     
     return schemas.SubjectMappingResult(
         matched_subjects=accepted_matches,
@@ -287,152 +452,230 @@ def _validate_subject_match(extracted_name: str, platform_name: str) -> bool:
     Semantic validation to catch obvious mismatches.
     Returns False for clearly wrong matches (e.g., "Geography" → "Physics").
     """
-    extracted_base = _extract_base_subject(extracted_name).lower()
-    platform_base = _extract_base_subject(platform_name).lower()
-    
-    # Define subject groups that should NOT be matched to each other
-    subject_groups = [
-        {"math", "mathematics", "further math", "further maths"},
-        {"english", "literature", "english language"},
-        {"physics", "chemistry", "biology"},
-        {"geography", "economics", "government", "civic"},
-        {"commerce", "accounting", "financial accounting"},
-        {"history", "christian religious studies", "islamic studies"},
-    ]
+    failure = _validation_failure(extracted_name, platform_name)
+    if failure:
+        logger.warning(failure)
+        return False
     
-    # Check if subjects are in different incompatible groups
-    extracted_group = None
-    platform_group = None
+    return True
+
+
+@lru_cache(maxsize=2048)
+def _validation_failure(extracted_name: str, platform_name: str) -> Optional[str]:
+    """Pure (cacheable) part of _validate_subject_match: the failure message, or None if valid"""
+    extracted_base = extract_base_subject(extracted_name).lower()
+    platform_base = extract_base_subject(platform_name).lower()
     
-    for group in subject_groups:
-        if any(subj in extracted_base for subj in group):
-            extracted_group = group
-        if any(subj in platform_base for subj in group):
-            platform_group = group
+    # Check if subjects are in different incompatible groups
+    extracted_group = _subject_group(extracted_base)
+    platform_group = _subject_group(platform_base)
     
     # If both are in identified groups and they're different = MISMATCH
-    if extracted_group and platform_group and extracted_group != platform_group:
-        logger.warning(
-            f"🚫 SEMANTIC VALIDATION FAILED: '{extracted_name}' in group {extracted_group}, "
-            f"but '{platform_name}' in group {platform_group}"
+    if extracted_group is not None and platform_group is not None and extracted_group != platform_group:
+        return (
+            f"🚫 SEMANTIC VALIDATION FAILED: '{extracted_name}' in group {set(_SUBJECT_GROUPS[extracted_group])}, "
+            f"but '{platform_name}' in group {set(_SUBJECT_GROUPS[platform_group])}"
         )
-        return False
     
     # Check critical keywords
-    critical_keywords = {
-        "math": ["math"],
-        "english": ["english", "literature"],
-        "physics": ["physics"],
-        "chemistry": ["chemistry", "chem"],
-        "biology": ["biology", "bio"],
-        "geography": ["geography", "geo"],
-        "economics": ["economics", "econ"],
-        "commerce": ["commerce"],
-        "accounting": ["accounting"],
-        "government": ["government", "gov"],
-        "civic": ["civic"],
-        "literature": ["literature", "english"],
-    }
-    
-    for keyword, required_terms in critical_keywords.items():
+    for keyword, required_terms in _CRITICAL_KEYWORDS:
         if keyword in extracted_base:
             if not any(term in platform_base for term in required_terms):
-                logger.warning(
+                return (
                     f"🚫 KEYWORD VALIDATION FAILED: '{extracted_name}' has '{keyword}', "
-                    f"but '{platform_name}' doesn't contain {required_terms}"
+                    f"but '{platform_name}' doesn't contain {list(required_terms)}"
                 )
-                return False
     
-    return True
+    return None
 
 
-def _calculate_match_scores(extracted: str, platform: str) -> Dict[str, float]:
-    """Calculate multiple matching scores for better accuracy."""
+def _subject_group_mask(subject_base: str) -> int:
+    """Bitmask of the _SUBJECT_GROUPS entries with a member contained in subject_base"""
+    mask = 0
+    for index, pattern in enumerate(_GROUP_PATTERNS):
+        if pattern.search(subject_base):
+            mask |= 1 << index
+    return mask
+
+
+def _subject_group(subject_base: str) -> Optional[int]:
+    """Index of the last _SUBJECT_GROUPS entry with a member contained in subject_base"""
+    mask = _subject_group_mask(subject_base)
+    return mask.bit_length() - 1 if mask else None
+
+
+def _score_matrix(
+    extracted_lower: List[str],
+    platform_lower: List[str],
+    extracted_bases: List[str],
+    platform_bases: List[str],
+    score_cutoff: float = 0.0
+) -> np.ndarray:
+    """
+    Batch equivalent of _calculate_match_scores(e, p).max() for every
+    (extracted, platform) pair. Returns a float64 matrix of shape (len(extracted), len(platform)).
+    Inputs must already be normalized (lowercased/stripped), so no rapidfuzz processor runs.
+    Scores below score_cutoff come back as 0 - rapidfuzz bails out of those comparisons early.
+    """
+    scores = np.zeros((len(extracted_lower), len(platform_lower)), dtype=np.float64)
+    
+    for scorer in (fuzz.ratio, fuzz.partial_ratio, fuzz.token_sort_ratio, fuzz.token_set_ratio):
+        np.maximum(
+            scores,
+            process.cdist(
+                extracted_lower, platform_lower,
+                scorer=scorer, processor=None, score_cutoff=score_cutoff, dtype=np.float64, workers=-1
+            ),
+            out=scores
+        )
+    
+    # Base-subject scores only count when both sides have a base subject
+    has_base = np.outer(
+        np.array([bool(b) for b in extracted_bases]),
+        np.array([bool(b) for b in platform_bases])
+    )
+    for scorer in (fuzz.ratio, fuzz.partial_ratio):
+        base_scores = process.cdist(
+            extracted_bases, platform_bases,
+            scorer=scorer, processor=None, score_cutoff=score_cutoff, dtype=np.float64, workers=-1
+        )
+        base_scores[~has_base] = 0.0
+        np.maximum(scores, base_scores, out=scores)
+    
+    return scores
+
+
+def _best_strategy(extracted: str, platform: str, boost_factor: float) -> str:
+    """Name of the scorer that produced a pair's direct-match score (for logging)"""
+    scores = _calculate_match_scores(extracted, platform)
+    best_idx = int(np.argmax(scores))  # first maximum, like max() over the old dict
+    
+    if boost_factor > 1.0 and min(100.0, scores[best_idx] * boost_factor) > scores[best_idx]:
+        return 'boosted'
+    return STRATEGY_NAMES[best_idx]
+
+
+def _calculate_match_scores(extracted: str, platform: str) -> np.ndarray:
+    """
+    Calculate multiple matching scores for better accuracy.
+    Returns one score per STRATEGY_NAMES entry; base scores are 0 when either side has no base subject.
+    """
     extracted_lower = extracted.lower().strip()
     platform_lower = platform.lower().strip()
     
-    scores = {
-        'exact': fuzz.ratio(extracted_lower, platform_lower),
-        'partial': fuzz.partial_ratio(extracted_lower, platform_lower),
-        'token_sort': fuzz.token_sort_ratio(extracted_lower, platform_lower),
-        'token_set': fuzz.token_set_ratio(extracted_lower, platform_lower),
-    }
-    
     # Extract base subjects and compare
-    base_extracted = _extract_base_subject(extracted)
-    base_platform = _extract_base_subject(platform)
-    
-    if base_extracted and base_platform:
-        scores['base_exact'] = fuzz.ratio(base_extracted.lower(), base_platform.lower())
-        scores['base_partial'] = fuzz.partial_ratio(base_extracted.lower(), base_platform.lower())
+    base_extracted = extract_base_subject(extracted).lower()
+    base_platform = extract_base_subject(platform).lower()
+    has_base = bool(base_extracted and base_platform)
+    
+    return np.array([
+        fuzz.ratio(extracted_lower, platform_lower),
+        fuzz.partial_ratio(extracted_lower, platform_lower),
+        fuzz.token_sort_ratio(extracted_lower, platform_lower),
+        fuzz.token_set_ratio(extracted_lower, platform_lower),
+        fuzz.ratio(base_extracted, base_platform) if has_base else 0.0,
+        fuzz.partial_ratio(base_extracted, base_platform) if has_base else 0.0,
+    ], dtype=np.float64)
+
+
+def _apply_boost(scores: np.ndarray, boost_factor: float) -> None:
+    """In-place min(100, score * boost_factor) over a float64 score array"""
+    if boost_factor > 1.0:
+        np.multiply(scores, boost_factor, out=scores)
+        np.minimum(scores, 100.0, out=scores)
+
+
+def _base_score_matrix(extracted_bases: List[str], platform_bases: List[str]) -> np.ndarray:
+    """Unboosted base-subject scores (max of ratio/partial/token_sort) for every pair"""
+    scores = np.zeros((len(extracted_bases), len(platform_bases)), dtype=np.float64)
+    
+    for scorer in (fuzz.ratio, fuzz.partial_ratio, fuzz.token_sort_ratio):
+        np.maximum(
+            scores,
+            process.cdist(
+                extracted_bases, platform_bases,
+                scorer=scorer, processor=None, dtype=np.float64, workers=-1
+            ),
+            out=scores
+        )
     
     return scores
 
 
 def _match_by_base_subject(
-    extracted_name: str,
-    platform_subjects: List[Subject],
+    base_scores: np.ndarray,
     boost_factor: float = 1.0
-) -> Tuple[Optional[Subject], float]:
-    """Match by comparing base subject names (ignoring level/grade qualifiers)."""
-    best_match = None
-    best_score = 0.0
-    
-    clean_extracted = _extract_base_subject(extracted_name)
-    
-    for platform_subject in platform_subjects:
-        clean_platform = _extract_base_subject(platform_subject.name)
-        
-        exact_score = fuzz.ratio(clean_extracted.lower(), clean_platform.lower())
-        partial_score = fuzz.partial_ratio(clean_extracted.lower(), clean_platform.lower())
-        token_score = fuzz.token_sort_ratio(clean_extracted.lower(), clean_platform.lower())
-        
-        score = max(exact_score, partial_score, token_score)
-        score = min(100.0, score * boost_factor)
-        
-        if score > best_score:
-            best_score = score
-            best_match = platform_subject
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Match by comparing base subject names (ignoring level/grade qualifiers).
+    Takes a _base_score_matrix() result (boosted in place) and returns, per row, the index
+    of the best platform subject and its boosted score.
+    """
+    _apply_boost(base_scores, boost_factor)
+    best_indices = base_scores.argmax(axis=1)
     
-    return best_match, best_score
+    return best_indices, base_scores[np.arange(len(base_scores)), best_indices]
+
+
+def _normalize_names(names: List[str]) -> Tuple[List[str], List[str]]:
+    """Lowercased/stripped names and lowercased base subjects, parallel to names"""
+    return (
+        [name.lower().strip() for name in names],
+        [extract_base_subject(name).lower() for name in names]
+    )
 
 
-def _extract_base_subject(subject_name: str) -> str:
+def _raw_scores(
+    normalized: Tuple[List[str], List[str]],
+    platform_subjects: List[SubjectRecord],
+    boost_factor: float
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Extract base subject name, removing level/grade modifiers.
-    
-    Examples:
-        "Mathematics SSS1 General" → "Mathematics"
-        "English Language SSS2 Science Individual" → "English Language"
-        "Economics (Revision)" → "Economics"
+    Unboosted (direct, base) score matrices for every extracted × platform pair.
+    Direct scores are cut off at the lowest raw score that can pass with boost_factor.
     """
-    if not subject_name:
-        return ""
-    
-    name = subject_name.strip()
+    extracted_lowers, extracted_bases = normalized
+    platform_bases = [s.base_lower for s in platform_subjects]
+    
+    direct = _score_matrix(
+        extracted_lowers,
+        [s.name_lower for s in platform_subjects],
+        extracted_bases,
+        platform_bases,
+        score_cutoff=CONFIDENCE_THRESHOLD / boost_factor
+    )
     
-    # Remove content in parentheses
-    name = re.sub(r'\(.*?\)', '', name).strip()
+    return direct, _base_score_matrix(extracted_bases, platform_bases)
+
+
+def _extend_level_scores(
+    normalized: Tuple[List[str], List[str]],
+    catalog: SubjectCatalog,
+    level_filter: Optional[str],
+    level_scores: Optional[Tuple[np.ndarray, np.ndarray]]
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Raw scores against all Individual subjects, built lazily from the level pool's scores:
+    only the Individual subjects outside that pool are scored here.
+    Returns None (score from scratch) when the level pool was never scored.
+    """
+    if level_scores is None:
+        return None
     
-    # Remove known modifiers
-    modifiers = [
-        ' SSS1 ', ' SSS2 ', ' SSS3 ',
-        ' JSS1 ', ' JSS2 ', ' JSS3 ',
-        ' General', ' Science', ' Commercial', ' Art', ' HOME',
-        ' Individual', ' ASPIRANT',
-        'SSS1', 'SSS2', 'SSS3', 'JSS1', 'JSS2', 'JSS3',
-        ' Revision', ' Practical',
-        'Individual'
-    ]
+    level_columns = catalog.individual_level_columns[level_filter]
+    other_columns = np.setdiff1d(np.arange(len(catalog.individual)), level_columns, assume_unique=True)
     
-    for modifier in modifiers:
-        name = name.replace(modifier, ' ')
-        name = name.replace(modifier.lower(), ' ')
+    shape = (len(normalized[0]), len(catalog.individual))
+    direct, base = np.empty(shape), np.empty(shape)
+    direct[:, level_columns], base[:, level_columns] = level_scores
     
-    # Clean up extra spaces
-    name = ' '.join(name.split())
+    if other_columns.size:
+        other_direct, other_base = _raw_scores(
+            normalized, [catalog.individual[j] for j in other_columns], PRIORITY_BOOST
+        )
+        direct[:, other_columns], base[:, other_columns] = other_direct, other_base
     
-    return name
+    return direct, base
 
 
 def get_subjects_by_class(
@@ -456,7 +699,14 @@ def get_subjects_by_class(
             for s in subjects
         ]
     
-    subjects = db.query(Subject).filter(Subject.class_id == class_id).all()
+    subjects = db.query(
+        Subject.id,
+        Subject.name,
+        Subject.code,
+        Subject.level,
+        Subject.grade,
+        Subject.compulsory
+    ).filter(Subject.class_id == class_id).all()
     
     return [
         {
@@ -2,18 +2,84 @@
 app/domains/individual_processing/tasks.py
 Celery tasks for asynchronous document processing
 """
+import asyncio
 from datetime import datetime
+from typing import Optional
+from celery.signals import celeryd_after_setup, task_postrun, worker_process_init, worker_process_shutdown
 from sqlalchemy.orm import Session
 
 from app.celery_app import celery_app
-from app.core.database import SessionLocal
+from app.core.database import ScopedSession
 from app.core.logger import get_logger
 from app.domains.individual_processing import service, schemas
+from app.domains.individual_processing.pdf_pool import set_worker_concurrency, shutdown_pdf_pool
 from app.models.individual_timetable import IndividualStudentTimetable
 from app.models.individual_scheme import IndividualStudentScheme
 
 logger = get_logger(__name__)
 
+# One event loop per worker process, reused by every task it runs
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this process's event loop, creating it on first use (e.g. solo pool)"""
+    global _worker_loop
+    
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    
+    return _worker_loop
+
+
+def _run_async(coro):
+    """Run a coroutine to completion on the persistent worker loop"""
+    return _get_worker_loop().run_until_complete(coro)
+
+
+@celeryd_after_setup.connect
+def _record_worker_concurrency(sender, instance, **kwargs):
+    """Size the PDF pool from the worker's actual --concurrency"""
+    set_worker_concurrency(instance.concurrency)
+
+
+@worker_process_init.connect
+def _init_worker_loop(**kwargs):
+    _get_worker_loop()
+    logger.info("🔁 Worker event loop initialized")
+
+
+@worker_process_shutdown.connect
+def _close_worker_loop(**kwargs):
+    global _worker_loop
+    
+    shutdown_pdf_pool()
+    
+    if _worker_loop is None or _worker_loop.is_closed():
+        return
+    
+    try:
+        _worker_loop.run_until_complete(service.close_http_client())
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to close HTTP client on worker shutdown: {e}")
+    finally:
+        _worker_loop.close()
+        _worker_loop = None
+
+
+@task_postrun.connect
+def _remove_task_session(**kwargs):
+    """Return the task's session connection to the pool once the task finishes"""
+    ScopedSession.remove()
+
+
+async def _process_timetable_and_flush(request: schemas.TimetableUploadRequest, db: Session):
+    """Process a timetable and wait for its background Java callbacks before the task returns"""
+    result = await service.process_timetable(request, db)
+    await service.wait_for_background_callbacks()
+    return result
+
 
 @celery_app.task(bind=True, name='process_timetable_async', max_retries=3)
 def process_timetable_async(self, timetable_id: int):
@@ -28,7 +94,7 @@ def process_timetable_async(self, timetable_id: int):
     """
     logger.info(f"🚀 Task started: process_timetable_async for timetable {timetable_id}")
     
-    db = SessionLocal()
+    db = ScopedSession()
     
     try:
         # Get timetable record
@@ -48,8 +114,7 @@ def process_timetable_async(self, timetable_id: int):
         )
         
         # Process timetable (this is now a coroutine, so we need to handle it)
-        import asyncio
-        result = asyncio.run(service.process_timetable(request, db))
+        result = _run_async(_process_timetable_and_flush(request, db))
         
         logger.info(f"✅ Timetable {timetable_id} processed successfully")
         
@@ -65,12 +130,12 @@ def process_timetable_async(self, timetable_id: int):
         logger.error(f"❌ Timetable processing failed: {e}", exc_info=True)
         
         try:
-            # Update timetable status
-            timetable = db.query(IndividualStudentTimetable).filter_by(id=timetable_id).first()
-            if timetable:
-                timetable.processing_status = 'FAILED'
-                timetable.processing_error = str(e)
-                db.commit()
+            # Update timetable status (single UPDATE, no load/change tracking)
+            db.query(IndividualStudentTimetable).filter_by(id=timetable_id).update(
+                {"processing_status": 'FAILED', "processing_error": str(e)},
+                synchronize_session=False
+            )
+            db.commit()
         except:
             db.rollback()
         
@@ -83,12 +148,6 @@ def process_timetable_async(self, timetable_id: int):
                 "message": f"Processing failed after retries: {str(e)}",
                 "timetable_id": timetable_id
             }
-    
-    finally:
-        try:
-            db.close()
-        except:
-            pass
 
 
 @celery_app.task(bind=True, name='process_scheme_async', max_retries=3)
@@ -104,7 +163,7 @@ def process_scheme_async(self, scheme_id: int):
     """
     logger.info(f"🚀 Task started: process_scheme_async for scheme {scheme_id}")
     
-    db = SessionLocal()
+    db = ScopedSession()
     
     try:
         # Get scheme record
@@ -125,8 +184,7 @@ def process_scheme_async(self, scheme_id: int):
         )
         
         # Process scheme
-        import asyncio
-        result = asyncio.run(service.process_scheme(request, db))
+        result = _run_async(service.process_scheme(request, db))
         
         logger.info(f"✅ Scheme {scheme_id} processed successfully")
         
@@ -142,12 +200,12 @@ def process_scheme_async(self, scheme_id: int):
         logger.error(f"❌ Scheme processing failed: {e}", exc_info=True)
         
         try:
-            # Update scheme status
-            scheme = db.query(IndividualStudentScheme).filter_by(id=scheme_id).first()
-            if scheme:
-                scheme.processing_status = 'FAILED'
-                scheme.processing_error = str(e)
-                db.commit()
+            # Update scheme status (single UPDATE, no load/change tracking)
+            db.query(IndividualStudentScheme).filter_by(id=scheme_id).update(
+                {"processing_status": 'FAILED', "processing_error": str(e)},
+                synchronize_session=False
+            )
+            db.commit()
         except:
             db.rollback()
         
@@ -160,9 +218,3 @@ def process_scheme_async(self, scheme_id: int):
                 "message": f"Processing failed after retries: {str(e)}",
                 "scheme_id": scheme_id
             }
-    
-    finally:
-        try:
-            db.close()
-        except:
-            pass
\ No newline at end of file
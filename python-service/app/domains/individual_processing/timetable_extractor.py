@@ -2,10 +2,17 @@
 app/domains/individual_processing/timetable_extractor.py
 ✅ SPRINT 9: Enhanced with conflict detection and validation
 """
-from typing import List, Set, Dict, Tuple, Optional
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Iterable, List, Set, Dict, Tuple, Optional
+from functools import lru_cache
+import logging
 import os
+import hashlib
 import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 import re
 import cv2
@@ -13,31 +20,25 @@ import numpy as np
 import pdfplumber
 import pytesseract
 from PIL import Image
-from openpyxl import load_workbook
-from datetime import time, timedelta
+from python_calamine import CalamineWorkbook
+from datetime import timedelta
 
 from app.core.logger import get_logger
 from app.domains.individual_processing.schemas import TimetableEntry
-import signal
-from contextlib import contextmanager
+from app.domains.individual_processing.extraction_cache import timetable_cache, file_sha256
+from app.domains.individual_processing.pdf_pool import extract_page_ranges, use_pdf_pool
+from time import monotonic
 
 logger = get_logger(__name__)
 
 class TimeoutException(Exception):
     pass
 
-@contextmanager
-def time_limit(seconds):
-    """Context manager for timeouts"""
-    def signal_handler(signum, frame):
-        raise TimeoutException("Timed out!")
-    
-    signal.signal(signal.SIGALRM, signal_handler)
-    signal.alarm(seconds)
-    try:
-        yield
-    finally:
-        signal.alarm(0)
+# Wall-clock budget for all Tesseract passes of one OCR strategy
+OCR_STRATEGY_TIMEOUT = 10  # seconds
+
+# Formats tesseract (leptonica) reads directly, so pytesseract can skip the PIL decode/PNG re-encode
+TESSERACT_NATIVE_FORMATS = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp'}
 
 # Days of the week
 DAYS_OF_WEEK = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY']
@@ -83,6 +84,81 @@ NON_ACADEMIC_PERIODS = {
     'Lunch', 'Recess', 'Morning Assembly', 'Devotion', 'Dismissal'
 }
 
+# Known subjects, longest first, so "English Language" wins over "English"
+_SUBJECTS_BY_LENGTH: Tuple[str, ...] = tuple(sorted(KNOWN_SUBJECTS, key=len, reverse=True))
+_SUBJECT_BY_LOWER: Dict[str, str] = {subject.lower(): subject for subject in _SUBJECTS_BY_LENGTH}
+_SUBJECT_ALTERNATION = '|'.join(re.escape(subject.lower()) for subject in _SUBJECTS_BY_LENGTH)
+
+# One scan for every known subject: the lookahead reports the longest whole-word subject
+# starting at each position (lowercased input)
+_KNOWN_SUBJECT_RE = re.compile(r'(?=\b(' + _SUBJECT_ALTERNATION + r')\b)')
+_KNOWN_SUBJECT_PREFIX_RE = re.compile(_SUBJECT_ALTERNATION)
+
+# Shorter subjects that also match wherever a longer one does ("english" inside "english language")
+_NESTED_SUBJECTS: Dict[str, Tuple[str, ...]] = {
+    longer: tuple(
+        shorter for shorter in _SUBJECT_BY_LOWER
+        if len(shorter) < len(longer)
+        and re.match(r'\b' + re.escape(shorter) + r'\b', longer)
+    )
+    for longer in _SUBJECT_BY_LOWER
+}
+
+_NON_ACADEMIC_RE = re.compile('|'.join(re.escape(period) for period in NON_ACADEMIC_PERIODS), re.IGNORECASE)
+
+# Period lines in structured text:
+# Pattern 1: "1st Period: English Language"
+# Pattern 2: "1st Period — 8:00–8:40"
+# Pattern 3: "Period 1: English"
+_PERIOD_PATTERNS = (
+    re.compile(r'(\d+)(?:st|nd|rd|th)\s+Period[\s:—\-]+(.+)', re.IGNORECASE),  # "1st Period: Subject"
+    re.compile(r'Period\s+(\d+)[\s:—\-]+(.+)', re.IGNORECASE),  # "Period 1: Subject"
+)
+_CELL_PERIOD_RE = re.compile(r'(\d+)(?:st|nd|rd|th)?\s+Period', re.IGNORECASE)
+
+# "8:00–8:40" with any dash type
+_TIME_RANGE_RE = re.compile(r'(\d{1,2}):(\d{2})\s*[–\-—~]\s*(\d{1,2}):(\d{2})')
+_TRAILING_DASH_RE = re.compile(r'\s*[–—-]\s*.*$')
+_HAS_WORD_RE = re.compile(r'[a-zA-Z]{3,}')
+
+# Delimited-block fallback
+_BLOCK_DELIMITER_RE = re.compile(r'[\n\t,;|]')
+_LEADING_NUMBER_RE = re.compile(r'^\d+[\.)\s]*')
+_PERIOD_PREFIX_RE = re.compile(r'(?:st|nd|rd|th)\s+period\s*:?\s*', re.IGNORECASE)
+
+# OCR artifacts like extra spaces within words, fixed in one pass (group i -> _OCR_REPLACEMENTS[i - 1])
+_OCR_FIXES = (
+    (r'mathema\s*tics', 'Mathematics'),
+    (r'econom\s*ics', 'Economics'),
+    (r'governm\s*ent', 'Government'),
+    (r'commerc\s*e', 'Commerce'),
+    (r'accountin\s*g', 'Accounting'),
+    (r'financi\s*al', 'Financial'),
+    (r'literatur\s*e', 'Literature'),
+    (r'biolog\s*y', 'Biology'),
+    (r'chemistr\s*y', 'Chemistry'),
+    (r'physic\s*s', 'Physics'),
+    (r'geograph\s*y', 'Geography'),
+    (r'histor\s*y', 'History'),
+    (r'book\s*keeping', 'Book Keeping'),  # also covers "bookkeeping"
+)
+_OCR_CLEAN_RE = re.compile('|'.join(f'({pattern})' for pattern, _ in _OCR_FIXES), re.IGNORECASE)
+_OCR_REPLACEMENTS = tuple(replacement for _, replacement in _OCR_FIXES)
+
+# Download chunk size for remote timetable files
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Shared download session: keeps TCP/TLS connections to the file store alive across
+# timetables and retries transient gateway errors
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=('GET',))
+)
+_http_session.mount('http://', _http_adapter)
+_http_session.mount('https://', _http_adapter)
+
 # Standard period times
 PERIOD_TIMES = {
     1: ("08:00", "08:40"),
@@ -100,6 +176,10 @@ PERIOD_TIMES = {
 # ✅ NEW: CONFLICT DETECTION CLASSES
 # ============================================================
 
+# (entry, start minutes, end minutes) - times parsed and grouped once in detect_conflicts
+TimedEntry = Tuple[TimetableEntry, Optional[int], Optional[int]]
+
+
 class ConflictType:
     """Conflict type constants"""
     TIME_OVERLAP = "TIME_OVERLAP"
@@ -132,25 +212,42 @@ class Conflict:
         }
 
 
-def detect_conflicts(entries: List[TimetableEntry]) -> List[Conflict]:
+def detect_conflicts(entries: List[TimetableEntry], fail_fast: bool = False) -> List[Conflict]:
     """
     ✅ NEW: Detect all types of conflicts in extracted timetable
+    With fail_fast, only HIGH-severity checks run and they stop at the first
+    conflict found - enough to decide validity, not a full report.
     """
     logger.info("🔍 Detecting conflicts in timetable...")
     
     conflicts = []
     
+    # Parse every entry's times once (minutes since midnight) and group by day, shared by all detectors
+    timed_entries = [(entry, *_entry_minutes(entry)) for entry in entries]
+    by_day = defaultdict(list)
+    for timed in timed_entries:
+        by_day[timed[0].day.upper()].append(timed)
+    
+    if fail_fast:
+        # Validity only depends on HIGH-severity conflicts (overlaps, invalid ranges)
+        conflicts = (
+            _detect_time_overlaps(by_day, fail_fast=True)
+            or _detect_invalid_time_ranges(timed_entries, fail_fast=True)
+        )
+        logger.info(f"✅ Fail-fast check found {len(conflicts)} high-severity conflict(s)")
+        return conflicts
+    
     # 1. Detect time overlaps
-    conflicts.extend(_detect_time_overlaps(entries))
+    conflicts.extend(_detect_time_overlaps(by_day))
     
     # 2. Detect duplicate subjects
-    conflicts.extend(_detect_duplicate_subjects(entries))
+    conflicts.extend(_detect_duplicate_subjects(by_day))
     
     # 3. Detect invalid time ranges
-    conflicts.extend(_detect_invalid_time_ranges(entries))
+    conflicts.extend(_detect_invalid_time_ranges(timed_entries))
     
     # 4. Detect unrealistic schedules
-    conflicts.extend(_detect_unrealistic_schedules(entries))
+    conflicts.extend(_detect_unrealistic_schedules(by_day))
     
     logger.info(f"✅ Found {len(conflicts)} conflicts")
     
@@ -162,32 +259,38 @@ def detect_conflicts(entries: List[TimetableEntry]) -> List[Conflict]:
     for ctype, count in by_type.items():
         logger.info(f"   {ctype}: {count}")
     
+    # Conflict details as one batched message per severity, not one log call per conflict
+    high = [c.description for c in conflicts if c.severity == "HIGH"]
+    if high and logger.isEnabledFor(logging.WARNING):
+        logger.warning("⚠️ High-severity conflicts:\n" + "\n".join(f"   {d}" for d in high))
+    
+    other = [c.description for c in conflicts if c.severity != "HIGH"]
+    if other and logger.isEnabledFor(logging.INFO):
+        logger.info("ℹ️ Other conflicts:\n" + "\n".join(f"   {d}" for d in other))
+    
     return conflicts
 
 
-def _detect_time_overlaps(entries: List[TimetableEntry]) -> List[Conflict]:
-    """Detect time overlap conflicts"""
+def _detect_time_overlaps(by_day: Dict[str, List[TimedEntry]], fail_fast: bool = False) -> List[Conflict]:
+    """Detect time overlap conflicts (only the first one with fail_fast)"""
     conflicts = []
     
-    # Group by day
-    by_day = {}
-    for entry in entries:
-        day = entry.day.upper()
-        if day not in by_day:
-            by_day[day] = []
-        by_day[day].append(entry)
-    
-    # Check each day for overlaps
+    # Check each day for overlaps (sweep line over entries sorted by start)
     for day, day_entries in by_day.items():
-        # Sort by start time
-        sorted_entries = sorted(day_entries, key=lambda e: e.start_time)
+        # Entries with unparseable times can't overlap
+        timed = sorted(
+            ((start, end, entry) for entry, start, end in day_entries if start is not None and end is not None),
+            key=lambda t: t[0]
+        )
         
-        for i in range(len(sorted_entries) - 1):
-            for j in range(i + 1, len(sorted_entries)):
-                entry1 = sorted_entries[i]
-                entry2 = sorted_entries[j]
-                
-                if _has_time_overlap(entry1, entry2):
+        # Entries that started earlier and haven't ended yet
+        active = []
+        for start2, end2, entry2 in timed:
+            active = [item for item in active if item[1] > start2]
+            
+            for start1, end1, entry1 in active:
+                # Two intervals overlap if: start1 < end2 AND start2 < end1
+                if start1 < end2:
                     conflict = Conflict(
                         conflict_type=ConflictType.TIME_OVERLAP,
                         day=day,
@@ -198,104 +301,96 @@ def _detect_time_overlaps(entries: List[TimetableEntry]) -> List[Conflict]:
                         entry2=_entry_to_dict(entry2)
                     )
                     conflicts.append(conflict)
-                    logger.warning(f"⚠️ {conflict.description}")
+                    if fail_fast:
+                        return conflicts
+            
+            active.append((start2, end2, entry2))
     
     return conflicts
 
 
-def _detect_duplicate_subjects(entries: List[TimetableEntry]) -> List[Conflict]:
+def _detect_duplicate_subjects(by_day: Dict[str, List[TimedEntry]]) -> List[Conflict]:
     """Detect duplicate subjects on same day"""
     conflicts = []
     
-    # Group by day
-    by_day = {}
-    for entry in entries:
-        day = entry.day.upper()
-        if day not in by_day:
-            by_day[day] = []
-        by_day[day].append(entry)
-    
     # Check each day for duplicates
     for day, day_entries in by_day.items():
-        # Group by subject
-        by_subject = {}
-        for entry in day_entries:
-            subj = entry.subject
-            if subj not in by_subject:
-                by_subject[subj] = []
-            by_subject[subj].append(entry)
+        # Count per subject, keeping only the first two entries as the conflict's examples
+        counts = Counter()
+        first_two = {}
+        for entry, _, _ in day_entries:
+            subject = entry.subject
+            counts[subject] += 1
+            if counts[subject] <= 2:
+                first_two.setdefault(subject, []).append(entry)
         
         # Check for subjects appearing more than twice (more than 2 is suspicious)
-        for subject, subj_entries in by_subject.items():
-            if len(subj_entries) > 2:
+        for subject, count in counts.items():
+            if count > 2:
                 conflict = Conflict(
                     conflict_type=ConflictType.DUPLICATE_SUBJECT,
                     day=day,
                     severity="MEDIUM",
-                    description=f"{subject} appears {len(subj_entries)} times on {day} - "
+                    description=f"{subject} appears {count} times on {day} - "
                               f"may be intentional for practical sessions",
-                    entry1=_entry_to_dict(subj_entries[0]),
-                    entry2=_entry_to_dict(subj_entries[1])
+                    entry1=_entry_to_dict(first_two[subject][0]),
+                    entry2=_entry_to_dict(first_two[subject][1])
                 )
                 conflicts.append(conflict)
-                logger.info(f"ℹ️ {conflict.description}")
     
     return conflicts
 
 
-def _detect_invalid_time_ranges(entries: List[TimetableEntry]) -> List[Conflict]:
-    """Detect invalid time ranges (end before start, unrealistic durations)"""
+def _detect_invalid_time_ranges(timed_entries: List[TimedEntry], fail_fast: bool = False) -> List[Conflict]:
+    """
+    Detect invalid time ranges (end before start, unrealistic durations).
+    With fail_fast, only the first invalid range is returned and durations aren't checked.
+    """
     conflicts = []
     
-    for entry in entries:
-        start = _parse_time(entry.start_time)
-        end = _parse_time(entry.end_time)
-        
-        if not start or not end:
+    for entry, start, end in timed_entries:
+        if start is None or end is None:
             continue
         
+        day = entry.day.upper()
+        
         # Check if end time is before or equal to start time
         if end <= start:
             conflict = Conflict(
                 conflict_type=ConflictType.INVALID_TIME_RANGE,
-                day=entry.day.upper(),
+                day=day,
                 severity="HIGH",
                 description=f"Invalid time range for {entry.subject}: end time ({entry.end_time}) "
                           f"is before or equal to start time ({entry.start_time})",
                 entry1=_entry_to_dict(entry)
             )
             conflicts.append(conflict)
-            logger.warning(f"⚠️ {conflict.description}")
+            if fail_fast:
+                return conflicts
+        
+        if fail_fast:
+            continue
         
         # Check for unrealistic duration (> 2 hours for single period)
-        duration_minutes = _time_diff_minutes(start, end)
+        duration_minutes = end - start
         if duration_minutes > 120:
             conflict = Conflict(
                 conflict_type=ConflictType.UNREALISTIC_DURATION,
-                day=entry.day.upper(),
+                day=day,
                 severity="MEDIUM",
                 description=f"Unusually long period for {entry.subject}: {duration_minutes} minutes "
                           f"({entry.start_time} - {entry.end_time}) - verify this is correct",
                 entry1=_entry_to_dict(entry)
             )
             conflicts.append(conflict)
-            logger.info(f"ℹ️ {conflict.description}")
     
     return conflicts
 
 
-def _detect_unrealistic_schedules(entries: List[TimetableEntry]) -> List[Conflict]:
+def _detect_unrealistic_schedules(by_day: Dict[str, List[TimedEntry]]) -> List[Conflict]:
     """Detect unrealistic schedules (too many periods per day)"""
     conflicts = []
     
-    # Group by day
-    by_day = {}
-    for entry in entries:
-        day = entry.day.upper()
-        if day not in by_day:
-            by_day[day] = []
-        by_day[day].append(entry)
-    
     # Check for days with too many periods
     for day, day_entries in by_day.items():
         if len(day_entries) > 10:  # Most schools have max 8-9 periods
@@ -307,46 +402,34 @@ def _detect_unrealistic_schedules(entries: List[TimetableEntry]) -> List[Conflic
                           f"this seems unusually high. Please verify."
             )
             conflicts.append(conflict)
-            logger.warning(f"⚠️ {conflict.description}")
     
     return conflicts
 
 
-def _has_time_overlap(entry1: TimetableEntry, entry2: TimetableEntry) -> bool:
-    """Check if two entries have overlapping time slots"""
-    start1 = _parse_time(entry1.start_time)
-    end1 = _parse_time(entry1.end_time)
-    start2 = _parse_time(entry2.start_time)
-    end2 = _parse_time(entry2.end_time)
-    
-    if not all([start1, end1, start2, end2]):
-        return False
-    
-    # Two intervals overlap if: start1 < end2 AND start2 < end1
-    return start1 < end2 and start2 < end1
-
-
-def _parse_time(time_str: str) -> Optional[time]:
-    """Parse time string to time object"""
+@lru_cache(maxsize=1024)
+def _parse_time_minutes(time_str: str) -> Optional[int]:
+    """Parse a time string to minutes since midnight (None if it isn't a valid time)"""
     if not time_str:
         return None
     
-    try:
-        # Handle formats: "08:00", "8:00", "08:00:00"
-        parts = time_str.split(':')
-        hour = int(parts[0])
-        minute = int(parts[1]) if len(parts) > 1 else 0
-        return time(hour, minute)
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to parse time: {time_str} - {e}")
-        return None
+    # Handle formats: "08:00", "8:00", "08:00:00", "8"
+    hour_str, sep, rest = time_str.partition(':')
+    hour_str = hour_str.strip()
+    minute_str = rest.partition(':')[0].strip() if sep else '0'
+    
+    if hour_str.isdecimal() and minute_str.isdecimal():
+        hour = int(hour_str)
+        minute = int(minute_str)
+        if hour < 24 and minute < 60:
+            return hour * 60 + minute
+    
+    logger.warning(f"⚠️ Failed to parse time: {time_str}")
+    return None
 
 
-def _time_diff_minutes(start: time, end: time) -> int:
-    """Calculate time difference in minutes"""
-    start_minutes = start.hour * 60 + start.minute
-    end_minutes = end.hour * 60 + end.minute
-    return end_minutes - start_minutes
+def _entry_minutes(entry: TimetableEntry) -> Tuple[Optional[int], Optional[int]]:
+    """(start, end) of an entry in minutes since midnight; None where a time doesn't parse"""
+    return _parse_time_minutes(entry.start_time), _parse_time_minutes(entry.end_time)
 
 
 def _entry_to_dict(entry: TimetableEntry) -> Dict:
@@ -361,14 +444,16 @@ def _entry_to_dict(entry: TimetableEntry) -> Dict:
     }
 
 
-def validate_timetable(entries: List[TimetableEntry]) -> Tuple[bool, List[Conflict]]:
+def validate_timetable(entries: List[TimetableEntry], fail_fast: bool = False) -> Tuple[bool, List[Conflict]]:
     """
     ✅ NEW: Validate complete timetable
     Returns: (is_valid, conflicts)
+    fail_fast stops at the first HIGH-severity conflict (see detect_conflicts),
+    for callers that only need is_valid.
     """
     logger.info("✅ Validating timetable...")
     
-    conflicts = detect_conflicts(entries)
+    conflicts = detect_conflicts(entries, fail_fast=fail_fast)
     
     # Count high severity conflicts
     high_severity = [c for c in conflicts if c.severity == "HIGH"]
@@ -387,54 +472,60 @@ def validate_timetable(entries: List[TimetableEntry]) -> Tuple[bool, List[Confli
 # EXISTING EXTRACTION FUNCTIONS (PRESERVED)
 # ============================================================
 
-def extract_timetable(file_url: str) -> List[TimetableEntry]:
+def extract_timetable(file_url: str) -> Tuple[List[TimetableEntry], Set[str]]:
     """
     Main entry point for timetable extraction.
     Extracts COMPLETE timetable structure with days, periods, times, and subjects.
     ✅ ENHANCED: Now includes conflict detection
+    Returns (entries, unique subject names).
     """
     logger.info(f"🚀 Starting timetable extraction from: {file_url}")
     
-    file_path, is_temp = _get_file_path(file_url)
+    file_path, is_temp, file_hash = _get_file_path(file_url)
     
     try:
-        if file_url.lower().endswith('.pdf'):
-            entries = _extract_from_pdf(file_path)
-        elif file_url.lower().endswith(('.xlsx', '.xls')):
-            entries = _extract_from_excel(file_path)
-        elif file_url.lower().endswith(('.png', '.jpg', '.jpeg')):
-            entries = _extract_from_image(file_path)
-        elif file_url.lower().endswith(('.doc', '.docx', '.txt')):
-            entries = _extract_from_text_document(file_path)
+        cached = timetable_cache.get(file_hash)
+        
+        if cached is not None:
+            entries = [TimetableEntry.model_validate(e) for e in cached["entries"]]
         else:
-            raise ValueError(f"Unsupported file type: {file_url}")
+            url_lower = file_url.lower()
+            if url_lower.endswith('.pdf'):
+                entries = _extract_from_pdf(file_path)
+            elif url_lower.endswith(('.xlsx', '.xls')):
+                entries = _extract_from_excel(file_path)
+            elif url_lower.endswith(('.png', '.jpg', '.jpeg')):
+                entries = _extract_from_image(file_path)
+            elif url_lower.endswith(('.doc', '.docx', '.txt')):
+                entries = _extract_from_text_document(file_path)
+            else:
+                raise ValueError(f"Unsupported file type: {file_url}")
+            
+            # Only cache successful extractions - OCR can time out on a bad run
+            if entries:
+                timetable_cache.set(file_hash, {"entries": [e.model_dump() for e in entries]})
         
         logger.info(f"📊 EXTRACTION SUMMARY:")
         logger.info(f"   Total entries extracted: {len(entries)}")
         
-        # Group by day for logging
-        by_day = {}
+        # Group by day for logging (keyed like DAYS_OF_WEEK), collecting unique subjects in the same pass
+        by_day = defaultdict(list)
+        unique_subjects = set()
         for entry in entries:
-            day = entry.day
-            if day not in by_day:
-                by_day[day] = []
-            by_day[day].append(entry.subject)
+            by_day[entry.day.upper()].append(entry.subject)
+            unique_subjects.add(entry.subject)
         
         for day in DAYS_OF_WEEK:
             if day in by_day:
                 logger.info(f"   {day}: {len(by_day[day])} periods - {', '.join(by_day[day][:3])}{'...' if len(by_day[day]) > 3 else ''}")
         
-        # ✅ NEW: Detect conflicts
-        is_valid, conflicts = validate_timetable(entries)
+        # ✅ NEW: Detect conflicts (validity only - callers needing the full list run validate_timetable)
+        is_valid, conflicts = validate_timetable(entries, fail_fast=True)
         
-        if conflicts:
-            logger.warning(f"⚠️ Detected {len(conflicts)} conflicts in extracted timetable")
-            for conflict in conflicts[:5]:  # Log first 5 conflicts
-                logger.warning(f"   {conflict.description}")
-            if len(conflicts) > 5:
-                logger.warning(f"   ... and {len(conflicts) - 5} more conflicts")
+        if not is_valid:
+            logger.warning(f"⚠️ Extracted timetable has high-severity conflicts, e.g. {conflicts[0].description}")
         
-        return entries
+        return entries, unique_subjects
         
     finally:
         if is_temp and os.path.exists(file_path):
@@ -442,56 +533,86 @@ def extract_timetable(file_url: str) -> List[TimetableEntry]:
 
 
 def _get_file_path(file_url: str) -> tuple:
-    """Get file path from URL or local path."""
+    """
+    Get file path from URL or local path.
+    Returns (file_path, is_temp, sha256 of the contents).
+    """
     if file_url.startswith(('http://', 'https://')):
         logger.info(f"⬇️ Downloading file from URL: {file_url}")
         
-        response = requests.get(file_url, timeout=30)
-        response.raise_for_status()
-        
         ext = Path(file_url).suffix or '.pdf'
+        digest = hashlib.sha256()
         
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
-        temp_file.write(response.content)
-        temp_file.close()
+        # Stream to disk in fixed-size chunks, hashing as we go
+        with _http_session.get(file_url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
+            try:
+                with temp_file:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        temp_file.write(chunk)
+                        digest.update(chunk)
+            except Exception:
+                os.remove(temp_file.name)
+                raise
         
         logger.info(f"✅ Downloaded to: {temp_file.name}")
-        return temp_file.name, True
+        return temp_file.name, True, digest.hexdigest()
     else:
         logger.info(f"📁 Using local file: {file_url}")
         
         if not os.path.exists(file_url):
             raise FileNotFoundError(f"File not found: {file_url}")
         
-        return file_url, False
+        return file_url, False, file_sha256(file_url)
+
+
+def _extract_pdf_page_range(file_path: str, start: int, stop: int) -> List[Optional[str]]:
+    """Extract text for pages [start, stop). Each worker opens its own document."""
+    with pdfplumber.open(file_path) as pdf:
+        return [pdf.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _extract_pdf_pages(file_path: str) -> List[Optional[str]]:
+    """
+    Extract page texts in page order.
+    Large files are split into contiguous page ranges and extracted in the shared PDF pool.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        if not use_pdf_pool(page_count):
+            return [page.extract_text() for page in pdf.pages]
+    
+    return extract_page_ranges(_extract_pdf_page_range, file_path, page_count)
 
 
 def _extract_from_pdf(file_path: str) -> List[TimetableEntry]:
     """Extract complete timetable structure from PDF."""
     logger.info("📖 Starting PDF parsing...")
     
-    with pdfplumber.open(file_path) as pdf:
-        all_text = ""
-        
-        for page_num, page in enumerate(pdf.pages):
-            text = page.extract_text()
-            if text:
-                all_text += text + "\n"
-                logger.info(f"📄 Page {page_num + 1}: {len(text)} characters")
+    page_texts = []
+    for page_num, text in enumerate(_extract_pdf_pages(file_path)):
+        if text:
+            page_texts.append(text)
+            logger.info(f"📄 Page {page_num + 1}: {len(text)} characters")
     
     # CRITICAL: Log the extracted text to see what we're working with
-    logger.info(f"📝 Total extracted text length: {len(all_text)} characters")
-    logger.debug(f"📝 First 500 chars: {all_text[:500]}")
+    logger.info(f"📝 Total extracted text length: {sum(len(t) + 1 for t in page_texts)} characters")
+    if page_texts:
+        logger.debug(f"📝 First 500 chars: {page_texts[0][:500]}")
     
-    # Try structured parsing first
-    entries = _parse_structured_timetable(all_text)
+    # Try structured parsing first, streaming cleaned lines page by page (no whole-document string)
+    entries = _parse_structured_lines(
+        chain.from_iterable(_clean_ocr_text(text).split('\n') for text in page_texts)
+    )
     
     if entries:
         logger.info(f"✅ Parsed {len(entries)} entries from structured format")
         return entries
     
     logger.warning("⚠️ Structured parsing failed, falling back to basic extraction")
-    return _fallback_extraction(all_text)
+    return _fallback_extraction("".join(text + "\n" for text in page_texts))
 
 
 def _parse_structured_timetable(text: str) -> List[TimetableEntry]:
@@ -499,17 +620,20 @@ def _parse_structured_timetable(text: str) -> List[TimetableEntry]:
     Parse structured timetable text format.
     Now handles multiple period formats and extracts ALL periods.
     """
-    entries = []
-    current_day = None
-    
     # Clean text
     text = _clean_ocr_text(text)
-    lines = text.split('\n')
     
-    logger.info(f"📝 Parsing {len(lines)} lines...")
+    # Whole document - only formatted when debugging
+    logger.debug(f"📝 FULL EXTRACTED TEXT:\n{text}")
     
-    # ADD THIS LINE TO SEE THE ACTUAL TEXT:
-    logger.info(f"📝 FULL EXTRACTED TEXT:\n{text}")
+    return _parse_structured_lines(text.split('\n'))
+
+
+def _parse_structured_lines(lines: Iterable[str]) -> List[TimetableEntry]:
+    """Parse already-cleaned timetable lines; `lines` may be a lazy stream (e.g. PDF pages)"""
+    entries = []
+    current_day = None
+    line_num = -1
     
     for line_num, line in enumerate(lines):
         line = line.strip()
@@ -526,59 +650,54 @@ def _parse_structured_timetable(text: str) -> List[TimetableEntry]:
         
         # Check if this line contains a period and subject
         if current_day:
-            # Pattern 1: "1st Period: English Language"
-            # Pattern 2: "1st Period — 8:00–8:40"
-            # Pattern 3: "Period 1: English"
-            period_patterns = [
-                r'(\d+)(?:st|nd|rd|th)\s+Period[\s:—\-]+(.+)',  # "1st Period: Subject"
-                r'Period\s+(\d+)[\s:—\-]+(.+)',  # "Period 1: Subject"
-            ]
-            
             matched = False
-            for pattern in period_patterns:
-                period_match = re.search(pattern, line, re.IGNORECASE)
-                
-                if period_match:
-                    period_num = int(period_match.group(1))
-                    rest_of_line = period_match.group(2).strip()
-                    
-                    # Extract time if present (multiple dash types)
-                    time_match = re.search(r'(\d{1,2}):(\d{2})\s*[–\-—~]\s*(\d{1,2}):(\d{2})', rest_of_line)
-                    if time_match:
-                        start_time = f"{int(time_match.group(1)):02d}:{time_match.group(2)}"
-                        end_time = f"{int(time_match.group(3)):02d}:{time_match.group(4)}"
-                        # Remove time from rest of line to get subject
-                        rest_of_line = re.sub(r'(\d{1,2}):(\d{2})\s*[–\-—~]\s*(\d{1,2}):(\d{2})', '', rest_of_line).strip()
-                    else:
-                        # Use default times
-                        start_time, end_time = PERIOD_TIMES.get(period_num, ("08:00", "09:00"))
-                    
-                    # Extract subject name
-                    subject = _extract_subject_name(rest_of_line)
+            # Cheap substring check before running the period regexes
+            if 'PERIOD' in line_upper:
+                for pattern in _PERIOD_PATTERNS:
+                    period_match = pattern.search(line)
                     
-                    if subject:
-                        entry = TimetableEntry(
-                            day=current_day.capitalize(),
-                            period_number=period_num,
-                            start_time=start_time,
-                            end_time=end_time,
-                            subject=subject,
-                            level="SSS1"
-                        )
-                        entries.append(entry)
-                        logger.debug(f"✅ {current_day} P{period_num}: {subject} ({start_time}-{end_time})")
-                        matched = True
-                        break
-                    else:
-                        logger.warning(f"⚠️ Period found but no subject: line {line_num}: '{line}'")
+                    if period_match:
+                        period_num = int(period_match.group(1))
+                        rest_of_line = period_match.group(2).strip()
+                        
+                        # Extract time if present (multiple dash types)
+                        time_match = _TIME_RANGE_RE.search(rest_of_line)
+                        if time_match:
+                            start_time = f"{int(time_match.group(1)):02d}:{time_match.group(2)}"
+                            end_time = f"{int(time_match.group(3)):02d}:{time_match.group(4)}"
+                            # Remove time from rest of line to get subject
+                            rest_of_line = _TIME_RANGE_RE.sub('', rest_of_line).strip()
+                        else:
+                            # Use default times
+                            start_time, end_time = PERIOD_TIMES.get(period_num, ("08:00", "09:00"))
+                        
+                        # Extract subject name
+                        subject = _extract_subject_name(rest_of_line)
+                        
+                        if subject:
+                            entry = TimetableEntry(
+                                day=current_day.capitalize(),
+                                period_number=period_num,
+                                start_time=start_time,
+                                end_time=end_time,
+                                subject=subject,
+                                level="SSS1"
+                            )
+                            entries.append(entry)
+                            logger.debug(f"✅ {current_day} P{period_num}: {subject} ({start_time}-{end_time})")
+                            matched = True
+                            break
+                        else:
+                            logger.warning(f"⚠️ Period found but no subject: line {line_num}: '{line}'")
             
             if not matched and line_num > 0:  # Don't warn for first line
                 logger.debug(f"🔍 Line {line_num} didn't match period pattern: '{line}'")
     
-    logger.info(f"📊 Structured parsing extracted {len(entries)} entries")
+    logger.info(f"📊 Structured parsing extracted {len(entries)} entries from {line_num + 1} lines")
     return entries
 
 
+@lru_cache(maxsize=4096)
 def _extract_subject_name(text: str) -> str:
     """
     Extract clean subject name from text.
@@ -590,7 +709,7 @@ def _extract_subject_name(text: str) -> str:
     original_text = text
     
     # Remove time patterns if any remain
-    text = re.sub(r'(\d{1,2}):(\d{2})\s*[–\-—~]\s*(\d{1,2}):(\d{2})', '', text).strip()
+    text = _TIME_RANGE_RE.sub('', text).strip()
     
     # Handle parentheses - keep base subject
     # "Economics (Revision)" → "Economics"
@@ -599,7 +718,7 @@ def _extract_subject_name(text: str) -> str:
     
     # Remove anything after dash (but handle "CRS / IRS" specially)
     if ' / ' not in text and '/' not in text:
-        text = re.sub(r'\s*[–—-]\s*.*$', '', text).strip()
+        text = _TRAILING_DASH_RE.sub('', text).strip()
     
     # Clean OCR artifacts
     text = _clean_ocr_text(text)
@@ -613,11 +732,9 @@ def _extract_subject_name(text: str) -> str:
         return None
     
     # Check if this is a non-academic period (skip it)
-    text_upper = text.upper()
-    for non_academic in NON_ACADEMIC_PERIODS:
-        if non_academic.upper() in text_upper:
-            logger.debug(f"⏭️ Skipping non-academic period: '{original_text}'")
-            return None
+    if _NON_ACADEMIC_RE.search(text):
+        logger.debug(f"⏭️ Skipping non-academic period: '{original_text}'")
+        return None
     
     # Try to match against known subjects
     matched = _match_subject_from_text(text)
@@ -626,7 +743,7 @@ def _extract_subject_name(text: str) -> str:
         return matched
     
     # If no match but text looks reasonable (has letters), return it
-    if re.search(r'[a-zA-Z]{3,}', text):
+    if _HAS_WORD_RE.search(text):
         logger.debug(f"⚠️ No exact match, using: '{text}' (from '{original_text}')")
         return text.title()
     
@@ -641,30 +758,10 @@ def _clean_ocr_text(text: str) -> str:
     if not text:
         return text
     
-    subject_patterns = {
-        r'mathema\s*tics': 'Mathematics',
-        r'econom\s*ics': 'Economics',
-        r'governm\s*ent': 'Government',
-        r'commerc\s*e': 'Commerce',
-        r'accountin\s*g': 'Accounting',
-        r'financi\s*al': 'Financial',
-        r'literatur\s*e': 'Literature',
-        r'biolog\s*y': 'Biology',
-        r'chemistr\s*y': 'Chemistry',
-        r'physic\s*s': 'Physics',
-        r'geograph\s*y': 'Geography',
-        r'histor\s*y': 'History',
-        r'book\s*keeping': 'Book Keeping',
-        r'bookkeeping': 'Book Keeping',
-    }
-    
-    cleaned = text
-    for pattern, replacement in subject_patterns.items():
-        cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
-    
-    return cleaned
+    return _OCR_CLEAN_RE.sub(lambda m: _OCR_REPLACEMENTS[m.lastindex - 1], text)
 
 
+@lru_cache(maxsize=4096)
 def _match_subject_from_text(text: str) -> str:
     """Match text against known subjects."""
     if not text or len(text) < 3:
@@ -673,24 +770,19 @@ def _match_subject_from_text(text: str) -> str:
     text_clean = _clean_ocr_text(text)
     text_lower = text_clean.lower().strip()
     
-    # Sort by length (longest first) to match "English Language" before "English"
-    sorted_subjects = sorted(KNOWN_SUBJECTS, key=len, reverse=True)
-    
     # Try exact match
-    for subject in sorted_subjects:
-        if subject.lower() == text_lower:
-            return subject
+    if text_lower in _SUBJECT_BY_LOWER:
+        return _SUBJECT_BY_LOWER[text_lower]
     
-    # Try partial match with word boundaries
-    for subject in sorted_subjects:
-        pattern = r'\b' + re.escape(subject.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            return subject
+    # Try partial match with word boundaries (longest subject found anywhere)
+    hits = _KNOWN_SUBJECT_RE.findall(text_lower)
+    if hits:
+        return _SUBJECT_BY_LOWER[max(hits, key=len)]
     
-    # Try if text starts with subject
-    for subject in sorted_subjects:
-        if text_lower.startswith(subject.lower()):
-            return subject
+    # Try if text starts with subject (alternatives are longest first)
+    prefix = _KNOWN_SUBJECT_PREFIX_RE.match(text_lower)
+    if prefix:
+        return _SUBJECT_BY_LOWER[prefix.group()]
     
     return None
 
@@ -755,15 +847,13 @@ def _match_known_subjects(text: str) -> Set[str]:
     text_clean = _clean_ocr_text(text)
     text_lower = text_clean.lower()
     
-    # Sort by length (longest first) to avoid partial matches
-    sorted_subjects = sorted(KNOWN_SUBJECTS, key=len, reverse=True)
-    
-    for subject in sorted_subjects:
-        pattern = r'\b' + re.escape(subject.lower()) + r'\b'
-        
-        if re.search(pattern, text_lower):
-            subjects.add(subject)
-            logger.debug(f"✅ Matched known subject: {subject}")
+    # One pass over the text; nested shorter subjects are implied by each hit
+    for hit in set(_KNOWN_SUBJECT_RE.findall(text_lower)):
+        for subject_lower in (hit,) + _NESTED_SUBJECTS[hit]:
+            subject = _SUBJECT_BY_LOWER[subject_lower]
+            if subject not in subjects:
+                subjects.add(subject)
+                logger.debug(f"✅ Matched known subject: {subject}")
     
     logger.info(f"📊 Known subjects matched: {len(subjects)}")
     return subjects
@@ -774,7 +864,7 @@ def _extract_from_delimited_blocks(text: str) -> Set[str]:
     subjects = set()
     
     text_clean = _clean_ocr_text(text)
-    blocks = re.split(r'[\n\t,;|]', text_clean)  # Split by common delimiters
+    blocks = _BLOCK_DELIMITER_RE.split(text_clean)  # Split by common delimiters
     
     logger.debug(f"📊 Found {len(blocks)} text blocks to analyze")
     
@@ -786,8 +876,8 @@ def _extract_from_delimited_blocks(text: str) -> Set[str]:
             continue
         
         # Remove numbers and common prefixes
-        block = re.sub(r'^\d+[\.)\s]*', '', block).strip()  # Remove "1.", "1)", "1 "
-        block = re.sub(r'(?:st|nd|rd|th)\s+period\s*:?\s*', '', block, flags=re.IGNORECASE).strip()
+        block = _LEADING_NUMBER_RE.sub('', block).strip()  # Remove "1.", "1)", "1 "
+        block = _PERIOD_PREFIX_RE.sub('', block).strip()
         
         if len(block) < 3:
             continue
@@ -806,26 +896,26 @@ def _extract_from_excel(file_path: str) -> List[TimetableEntry]:
     logger.info("📊 Parsing Excel file...")
     entries = []
     
-    wb = load_workbook(filename=file_path)
+    # calamine parses the workbook natively (xlsx and legacy xls) and hands back plain Python rows
+    wb = CalamineWorkbook.from_path(file_path)
     
-    for sheet in wb.worksheets:
-        logger.info(f"📄 Processing sheet: {sheet.title}")
+    for sheet_index, sheet_name in enumerate(wb.sheet_names):
+        logger.info(f"📄 Processing sheet: {sheet_name}")
         
         # Try to parse as structured timetable
-        sheet_entries = _parse_excel_sheet(sheet)
+        rows = wb.get_sheet_by_index(sheet_index).to_python(skip_empty_area=True)
+        sheet_entries = _parse_excel_sheet(rows)
         entries.extend(sheet_entries)
     
-    wb.close()
-    
     return entries
 
 
-def _parse_excel_sheet(sheet) -> List[TimetableEntry]:
-    """Parse Excel sheet as timetable."""
+def _parse_excel_sheet(rows: List[list]) -> List[TimetableEntry]:
+    """Parse Excel sheet rows (cell values) as timetable."""
     entries = []
     current_day = None
     
-    for row in sheet.iter_rows(values_only=True):
+    for row in rows:
         if not row or not any(row):
             continue
         
@@ -843,7 +933,10 @@ def _parse_excel_sheet(sheet) -> List[TimetableEntry]:
                     continue
                 
                 cell_text = str(cell).strip()
-                period_match = re.search(r'(\d+)(?:st|nd|rd|th)?\s+Period', cell_text, re.IGNORECASE)
+                if 'PERIOD' not in cell_text.upper():
+                    continue
+                
+                period_match = _CELL_PERIOD_RE.search(cell_text)
                 
                 if period_match:
                     period_num = int(period_match.group(1))
@@ -874,8 +967,7 @@ def _enhance_with_clahe(image_path: str) -> str:
     Apply CLAHE (Contrast Limited Adaptive Histogram Equalization) enhancement.
     Returns path to enhanced image.
     """
-    img = cv2.imread(image_path)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)  # decode straight to 1 channel
     
     # Apply CLAHE
     clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
@@ -890,8 +982,7 @@ def _enhance_with_clahe(image_path: str) -> str:
 
 def _enhance_with_binary_threshold(image_path: str) -> str:
     """Apply simple binary threshold (faster than adaptive)"""
-    img = cv2.imread(image_path)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)  # decode straight to 1 channel
     
     # Simple Otsu threshold (fast)
     _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -915,51 +1006,49 @@ def _extract_from_image(file_path: str) -> List[TimetableEntry]:
     best_entries = []
     
     try:
-        # Strategy 1: Try original image first (no enhancement) - 10 second timeout
+        # Strategy 1: Try original image first (no enhancement) - OCR_STRATEGY_TIMEOUT budget
         logger.info("📸 Strategy 1: Trying original image...")
         try:
-            with time_limit(10):
-                text = _try_ocr_extraction(file_path, "original")
-                all_texts.append(("original", text))
-                
-                if len(text.strip()) > 50:
-                    logger.info(f"✅ Original: {len(text)} chars")
-                    entries = _parse_structured_timetable(text)
-                    if entries:
-                        return entries
-                    if len(text) > len(best_text):
-                        best_text = text
-                        best_entries = entries
-                else:
-                    logger.warning(f"⚠️ Original: Only {len(text)} chars")
+            text = _try_ocr_extraction(file_path, "original")
+            all_texts.append(("original", text))
+            
+            if len(text.strip()) > 50:
+                logger.info(f"✅ Original: {len(text)} chars")
+                entries = _parse_structured_timetable(text)
+                if entries:
+                    return entries
+                if len(text) > len(best_text):
+                    best_text = text
+                    best_entries = entries
+            else:
+                logger.warning(f"⚠️ Original: Only {len(text)} chars")
         except TimeoutException:
-            logger.warning("⚠️ Strategy 1 timed out after 10s")
+            logger.warning(f"⚠️ Strategy 1 timed out after {OCR_STRATEGY_TIMEOUT}s")
         except Exception as e:
             logger.warning(f"⚠️ Strategy 1 failed: {e}")
         
-        # Strategy 2: Try with CLAHE - 10 second timeout
+        # Strategy 2: Try with CLAHE - OCR_STRATEGY_TIMEOUT budget
         logger.info("📸 Strategy 2: Trying CLAHE enhancement...")
         enhanced_clahe = None
         try:
-            with time_limit(10):
-                enhanced_clahe = _enhance_with_clahe(file_path)
-                text = _try_ocr_extraction(enhanced_clahe, "CLAHE")
-                all_texts.append(("CLAHE", text))
-                
-                if len(text.strip()) > 50:
-                    logger.info(f"✅ CLAHE: {len(text)} chars")
-                    entries = _parse_structured_timetable(text)
-                    if entries:
-                        if enhanced_clahe and os.path.exists(enhanced_clahe):
-                            os.remove(enhanced_clahe)
-                        return entries
-                    if len(text) > len(best_text):
-                        best_text = text
-                        best_entries = entries
-                else:
-                    logger.warning(f"⚠️ CLAHE: Only {len(text)} chars")
+            enhanced_clahe = _enhance_with_clahe(file_path)
+            text = _try_ocr_extraction(enhanced_clahe, "CLAHE")
+            all_texts.append(("CLAHE", text))
+            
+            if len(text.strip()) > 50:
+                logger.info(f"✅ CLAHE: {len(text)} chars")
+                entries = _parse_structured_timetable(text)
+                if entries:
+                    if enhanced_clahe and os.path.exists(enhanced_clahe):
+                        os.remove(enhanced_clahe)
+                    return entries
+                if len(text) > len(best_text):
+                    best_text = text
+                    best_entries = entries
+            else:
+                logger.warning(f"⚠️ CLAHE: Only {len(text)} chars")
         except TimeoutException:
-            logger.warning("⚠️ Strategy 2 timed out after 10s")
+            logger.warning(f"⚠️ Strategy 2 timed out after {OCR_STRATEGY_TIMEOUT}s")
         except Exception as e:
             logger.warning(f"⚠️ Strategy 2 failed: {e}")
         finally:
@@ -973,25 +1062,24 @@ def _extract_from_image(file_path: str) -> List[TimetableEntry]:
         logger.info("📸 Strategy 3: Trying simple binary threshold...")
         enhanced_binary = None
         try:
-            with time_limit(10):
-                enhanced_binary = _enhance_with_binary_threshold(file_path)
-                text = _try_ocr_extraction(enhanced_binary, "binary")
-                all_texts.append(("binary", text))
-                
-                if len(text.strip()) > 50:
-                    logger.info(f"✅ Binary: {len(text)} chars")
-                    entries = _parse_structured_timetable(text)
-                    if entries:
-                        if enhanced_binary and os.path.exists(enhanced_binary):
-                            os.remove(enhanced_binary)
-                        return entries
-                    if len(text) > len(best_text):
-                        best_text = text
-                        best_entries = entries
-                else:
-                    logger.warning(f"⚠️ Binary: Only {len(text)} chars")
+            enhanced_binary = _enhance_with_binary_threshold(file_path)
+            text = _try_ocr_extraction(enhanced_binary, "binary")
+            all_texts.append(("binary", text))
+            
+            if len(text.strip()) > 50:
+                logger.info(f"✅ Binary: {len(text)} chars")
+                entries = _parse_structured_timetable(text)
+                if entries:
+                    if enhanced_binary and os.path.exists(enhanced_binary):
+                        os.remove(enhanced_binary)
+                    return entries
+                if len(text) > len(best_text):
+                    best_text = text
+                    best_entries = entries
+            else:
+                logger.warning(f"⚠️ Binary: Only {len(text)} chars")
         except TimeoutException:
-            logger.warning("⚠️ Strategy 3 timed out after 10s")
+            logger.warning(f"⚠️ Strategy 3 timed out after {OCR_STRATEGY_TIMEOUT}s")
         except Exception as e:
             logger.warning(f"⚠️ Strategy 3 failed: {e}")
         finally:
@@ -1029,32 +1117,46 @@ def _extract_from_image(file_path: str) -> List[TimetableEntry]:
         return []
 
 
-def _try_ocr_extraction(image_path: str, method: str) -> str:
+def _try_ocr_extraction(image_path: str, method: str, timeout: float = OCR_STRATEGY_TIMEOUT) -> str:
     """
     Try OCR extraction with multiple Tesseract configurations.
     OPTIMIZED: Only tries the best configs, faster execution.
+    All configs share one `timeout` budget, enforced by pytesseract killing the
+    tesseract subprocess (works from any thread, unlike SIGALRM).
+    Raises TimeoutException if the budget runs out before any config succeeds.
     """
     results = []
+    deadline = monotonic() + timeout
+    timed_out = False
     
-    # Only try the 2 most effective configs (faster)
-    
-    # Config 1: PSM 6 (uniform block of text) - best for most timetables
-    try:
-        image = Image.open(image_path)
-        text = pytesseract.image_to_string(image, config='--psm 6')
-        results.append(("psm6", text))
-        logger.debug(f"  {method} + PSM 6: {len(text)} chars")
-    except Exception as e:
-        logger.debug(f"  {method} + PSM 6 failed: {e}")
-    
-    # Config 2: PSM 11 (sparse text) - good for tables
-    try:
-        image = Image.open(image_path)
-        text = pytesseract.image_to_string(image, config='--psm 11')
-        results.append(("psm11", text))
-        logger.debug(f"  {method} + PSM 11: {len(text)} chars")
-    except Exception as e:
-        logger.debug(f"  {method} + PSM 11 failed: {e}")
+    # Hand tesseract the file itself when it can read it; otherwise decode once with PIL
+    if Path(image_path).suffix.lower() in TESSERACT_NATIVE_FORMATS:
+        ocr_input = image_path
+    else:
+        ocr_input = Image.open(image_path)
+    
+    # Only try the 2 most effective configs (faster):
+    # PSM 6 (uniform block of text) - best for most timetables
+    # PSM 11 (sparse text) - good for tables
+    for config_name, psm in (("psm6", 6), ("psm11", 11)):
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        
+        try:
+            text = pytesseract.image_to_string(ocr_input, config=f'--psm {psm}', timeout=remaining)
+            results.append((config_name, text))
+            logger.debug(f"  {method} + PSM {psm}: {len(text)} chars")
+        except RuntimeError as e:
+            # pytesseract raises RuntimeError when it kills a timed-out tesseract process
+            if 'timeout' not in str(e).lower():
+                logger.debug(f"  {method} + PSM {psm} failed: {e}")
+                continue
+            timed_out = True
+            break
+        except Exception as e:
+            logger.debug(f"  {method} + PSM {psm} failed: {e}")
     
     # Return the longest result
     if results:
@@ -1062,6 +1164,9 @@ def _try_ocr_extraction(image_path: str, method: str) -> str:
         logger.info(f"  Best config for {method}: {best_config} ({len(best_text)} chars)")
         return best_text
     
+    if timed_out:
+        raise TimeoutException(f"OCR ({method}) timed out after {timeout}s")
+    
     return ""
 
 def _extract_from_text_document(file_path: str) -> List[TimetableEntry]:
@@ -1092,15 +1197,12 @@ def _assess_image_quality(image_path: str) -> Dict[str, any]:
     logger.info(f"🔍 Assessing image quality: {image_path}")
     
     try:
-        # Read image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Read image (decoded straight to grayscale)
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             logger.error(f"❌ Could not read image: {image_path}")
             return {"score": 0, "issues": ["Could not read image file"]}
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
         # Calculate metrics
         issues = []
         score = 100
@@ -1190,14 +1292,11 @@ def _enhance_image_for_ocr(image_path: str) -> str:
     logger.info(f"🖼️ Enhancing image for OCR: {image_path}")
     
     try:
-        # Read image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Read image (decoded straight to grayscale)
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             return image_path
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
         # Normalize
         normalized = cv2.normalize(gray, None, alpha=0, beta=255, norm_type=cv2.NORM_MINMAX)
         
@@ -10,6 +10,8 @@ from app.domains.video_processing.router import router as video_processing_route
 from app.domains.video_processing.generation_router import router as video_gen_router
 from app.domains.video_analytics.router import router as video_analytics_router
 from app.domains.individual_processing.router import router as individual_router
+from app.domains.individual_processing import service as individual_service
+from app.domains.individual_processing.pdf_pool import shutdown_pdf_pool
 from app.domains.lesson_processing import service, schemas
 from app.domains.individual_processing.document_upload_router import router as upload_router
 from app.core.database import get_db
@@ -115,4 +117,6 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await individual_service.close_http_client()
+    shutdown_pdf_pool()
     logger.info("🛑 AI Service shutting down")
\ No newline at end of file
@@ -3,7 +3,7 @@ app/models/subject.py
 Python SQLAlchemy model that matches Java Subject entity exactly
 """
 from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
-from sqlalchemy.orm import relationship, Session
+from sqlalchemy.orm import relationship, Session, column_property
 from app.models.base import Base
 
 
@@ -32,6 +32,9 @@ class Subject(Base):
     name = Column(String(100), nullable=False)
     code = Column(String(50))
     
+    # Derived in SQL at load time (no DB column - the schema is owned by the Java service)
+    is_individual = column_property(name.contains('Individual'))
+    
     # Level Classification
     level = Column(String(20), nullable=False)  # JUNIOR or SENIOR
     grade = Column(String(10), nullable=False)  # JSS1, JSS2, JSS3, SSS1, SSS2, SSS3
@@ -80,17 +83,17 @@ class Subject(Base):
             List of Subject objects available to the student
         """
         # First, get the student's grade from any subject in their class
-        sample_subject = db.query(Subject).filter(Subject.class_id == class_id).first()
+        student_grade = db.query(Subject.grade).filter(
+            Subject.class_id == class_id
+        ).limit(1).scalar()  # e.g., "SSS1"
         
-        if not sample_subject:
+        if not student_grade:
             return []
         
-        student_grade = sample_subject.grade  # e.g., "SSS1"
-        
         # Query 1: Get department-specific Individual subjects for this class
         class_subjects = db.query(Subject).filter(
             Subject.class_id == class_id,
-            Subject.name.contains('Individual')
+            Subject.is_individual
         ).all()
         
         # Query 2: Get General Individual subjects for this grade
@@ -98,7 +101,7 @@ class Subject(Base):
         general_subjects = db.query(Subject).filter(
             Subject.grade == student_grade,
             Subject.department_id == 4,  # General department
-            Subject.name.contains('Individual')
+            Subject.is_individual
         ).all()
         
         # Combine both lists
@@ -135,7 +138,7 @@ class Subject(Base):
         )
         
         if individual_only:
-            query = query.filter(Subject.name.contains('Individual'))
+            query = query.filter(Subject.is_individual)
         
         return query.all()
     
@@ -166,6 +169,6 @@ class Subject(Base):
             query = query.filter(Subject.grade == grade)
         
         if individual_only:
-            query = query.filter(Subject.name.contains('Individual'))
+            query = query.filter(Subject.is_individual)
         
         return query.all()
\ No newline at end of file